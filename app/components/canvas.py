@@ -1,4 +1,10 @@
 import reflex as rx
+from app.core.symbols import (
+    SYMBOL_LIBRARY,
+    SYMBOL_STROKE_COLOR,
+    SYMBOL_STROKE_MM,
+    symbol_path_data,
+)
 from app.states.main_state import MainState
 
 
@@ -97,7 +103,7 @@ def canvas_toolbar() -> rx.Component:
     )
 
 
-from app.states.main_state import Shape
+from app.states.main_state import Room, Shape, SymbolInstance, TransformHandle
 
 
 def shape_renderer(shape: Shape) -> rx.Component:
@@ -133,8 +139,8 @@ def shape_renderer(shape: Shape) -> rx.Component:
             ),
             (
                 "freehand",
-                rx.el.svg.polyline(
-                    points=MainState.svg_points[shape["id"]],
+                rx.el.svg.path(
+                    d=MainState.svg_points[shape["id"]],
                     stroke=shape["stroke_color"],
                     stroke_width=shape["stroke_mm"],
                     fill="none",
@@ -145,6 +151,93 @@ def shape_renderer(shape: Shape) -> rx.Component:
     )
 
 
+def room_renderer(room: Room) -> rx.Component:
+    return rx.el.g(
+        rx.el.polygon(
+            points=MainState.svg_points[room["id"]],
+            fill="rgba(59, 130, 246, 0.08)",
+            stroke="none",
+        ),
+        rx.el.svg.text(
+            room["area"].to_string() + " ft²",
+            x=room["centroid"]["x"].to_string(),
+            y=room["centroid"]["y"].to_string(),
+            font_size=1,
+            text_anchor="middle",
+            fill="#1d4ed8",
+            class_name="pointer-events-none select-none",
+        ),
+    )
+
+
+def handle_renderer(handle: TransformHandle) -> rx.Component:
+    return rx.el.rect(
+        x=handle["x"].to_string(),
+        y=handle["y"].to_string(),
+        width=handle["size"].to_string(),
+        height=handle["size"].to_string(),
+        fill="#ffffff",
+        stroke="#ea580c",
+        stroke_width=0.08,
+        style={"cursor": handle["cursor"]},
+    )
+
+
+def selection_overlay() -> rx.Component:
+    """Selection box and handles; while a handle is dragged, a ghost of the
+    selection follows the drag matrix instead."""
+    return rx.cond(
+        MainState.drag_transform != "",
+        rx.el.g(
+            rx.foreach(MainState.transformable_shapes, shape_renderer),
+            transform=MainState.drag_transform,
+            opacity=0.6,
+        ),
+        rx.el.g(
+            rx.el.polygon(
+                points=MainState.selection_box_points,
+                fill="none",
+                stroke="#ea580c",
+                stroke_width=0.08,
+                stroke_dasharray="0.4 0.3",
+            ),
+            rx.foreach(MainState.selection_handles, handle_renderer),
+        ),
+    )
+
+
+def symbol_defs() -> rx.Component:
+    """Library geometry, emitted once per page; placements reference it."""
+    return rx.el.svg.defs(
+        *[
+            rx.el.g(
+                *[rx.el.svg.path(d=d) for d in symbol_path_data(symbol)],
+                id=f"sym-{symbol['id']}",
+                stroke=SYMBOL_STROKE_COLOR,
+                stroke_width=SYMBOL_STROKE_MM,
+                fill="none",
+            )
+            for symbol in SYMBOL_LIBRARY
+        ]
+    )
+
+
+def symbol_renderer(instance: SymbolInstance) -> rx.Component:
+    """Places the shared definition; the transform is built in the browser
+    from the instance's own fields, so each placement is sent once.
+    ``use`` has no ``transform`` prop, so it is passed as a raw attribute
+    rather than falling through to CSS."""
+    transform = (
+        f"translate({instance['x']} {instance['y']}) "
+        f"rotate({instance['rotation_deg']}) "
+        f"scale({instance['scale_x']} {instance['scale_y']})"
+    )
+    return rx.el.svg.use(
+        href="#sym-" + instance["symbol_id"],
+        custom_attrs={"transform": transform},
+    )
+
+
 def canvas_area() -> rx.Component:
     """The main drawing canvas area with toolbar."""
     svg_id = "drawing-canvas"
@@ -152,27 +245,31 @@ def canvas_area() -> rx.Component:
         canvas_toolbar(),
         rx.el.div(
             rx.el.svg(
+                symbol_defs(),
                 rx.el.g(
+                    rx.foreach(MainState.rooms, room_renderer),
                     rx.foreach(MainState.shapes, shape_renderer),
+                    rx.foreach(MainState.symbol_instances, symbol_renderer),
                     rx.cond(
                         MainState.drawing_shape.is_not_none(),
                         shape_renderer(MainState.drawing_shape),
                         rx.el.g(),
                     ),
+                    selection_overlay(),
                 ),
                 on_mouse_down=MainState.handle_canvas_mouse_down(
                     rx.event.call_script(
-                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, button: e.button, bounding_client_rect: e.target.getBoundingClientRect() })"
+                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, button: e.button, shift_key: e.shiftKey, alt_key: e.altKey, bounding_client_rect: e.currentTarget.getBoundingClientRect() })"
                     )
                 ),
                 on_mouse_move=MainState.handle_canvas_mouse_move(
                     rx.event.call_script(
-                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, bounding_client_rect: e.target.getBoundingClientRect() })"
+                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, shift_key: e.shiftKey, alt_key: e.altKey, bounding_client_rect: e.currentTarget.getBoundingClientRect() })"
                     )
                 ).throttle(16),
                 on_mouse_up=MainState.handle_canvas_mouse_up(
                     rx.event.call_script(
-                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, button: e.button, bounding_client_rect: e.target.getBoundingClientRect() })"
+                        "(e) => ({ client_x: e.clientX, client_y: e.clientY, button: e.button, shift_key: e.shiftKey, alt_key: e.altKey, bounding_client_rect: e.currentTarget.getBoundingClientRect() })"
                     )
                 ),
                 on_mouse_leave=MainState.handle_canvas_mouse_leave,
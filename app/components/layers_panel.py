@@ -0,0 +1,44 @@
+import reflex as rx
+from app.states.main_state import MainState, Layer
+
+
+def layer_row(layer: Layer) -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.cond(
+                layer["visible"],
+                rx.icon("eye", class_name="size-4"),
+                rx.icon("eye-off", class_name="size-4 text-neutral-400"),
+            ),
+            on_click=lambda: MainState.toggle_layer_visibility(layer["name"]),
+            title="Toggle Visibility",
+            aria_label="Toggle Visibility",
+            class_name="p-1 rounded hover:bg-neutral-200",
+        ),
+        rx.el.button(
+            rx.cond(
+                layer["locked"],
+                rx.icon("lock", class_name="size-4 text-orange-600"),
+                rx.icon("lock-open", class_name="size-4 text-neutral-400"),
+            ),
+            on_click=lambda: MainState.toggle_layer_lock(layer["name"]),
+            title="Toggle Lock",
+            aria_label="Toggle Lock",
+            class_name="p-1 rounded hover:bg-neutral-200",
+        ),
+        rx.el.span(layer["name"], class_name="flex-1 text-sm truncate"),
+        rx.el.span(
+            MainState.layer_counts.get(layer["name"], 0),
+            class_name="text-xs text-neutral-500",
+        ),
+        class_name="flex items-center gap-1",
+    )
+
+
+def layers_panel() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3("Layers", class_name="font-semibold mb-2 text-neutral-700"),
+        rx.foreach(MainState.layers, layer_row),
+        class_name="border-t pt-4 mt-4",
+        aria_label="Layers",
+    )
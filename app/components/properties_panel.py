@@ -1,5 +1,6 @@
 import reflex as rx
 from app.states.main_state import MainState
+from app.components.layers_panel import layers_panel
 
 
 def property_input(label: str, **kwargs) -> rx.Component:
@@ -13,75 +14,104 @@ def property_input(label: str, **kwargs) -> rx.Component:
     )
 
 
+def dimension_input(label: str, field: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.label(label, class_name="text-xs text-neutral-500"),
+        rx.el.input(
+            value=MainState.dimension_inputs[field],
+            on_change=lambda value: MainState.set_dimension(field, value),
+            on_blur=MainState.refresh_dimension_inputs,
+            disabled=~MainState.can_edit_dimensions,
+            type="number",
+            step="0.1",
+            class_name="w-full p-1.5 border border-neutral-300 rounded-md shadow-inner text-sm",
+        ),
+    )
+
+
 def properties_panel() -> rx.Component:
     return rx.el.aside(
         rx.el.h2(
             "Properties",
             class_name="text-lg font-bold text-neutral-800 border-b pb-2 mb-4",
         ),
-        rx.cond(
-            MainState.selected_shape.is_not_none(),
-            rx.el.div(
-                rx.el.p(
-                    f"ID: {MainState.selected_shape['id']}",
-                    class_name="text-xs text-neutral-500 mb-4 truncate",
-                ),
-                property_input(
-                    "Stroke (mm)",
-                    default_value=MainState.selected_shape["stroke_mm"].to_string(),
-                    type="number",
-                    step="0.05",
-                ),
-                property_input(
-                    "Stroke Color",
-                    type="color",
-                    default_value=MainState.selected_shape["stroke_color"],
-                ),
+        rx.el.div(
+            rx.cond(
+                MainState.selected_shape.is_not_none(),
                 rx.el.div(
-                    rx.el.label(
-                        "Dimensions (ft)",
-                        class_name="text-sm font-medium text-neutral-600 mb-1",
-                    ),
                     rx.el.p(
-                        "W: 50.00, H: 90.00",
-                        class_name="text-sm p-2 bg-neutral-100 rounded",
+                        f"ID: {MainState.selected_shape['id']}",
+                        class_name="text-xs text-neutral-500 mb-4 truncate",
                     ),
-                    class_name="mb-4",
-                ),
-                rx.el.div(
-                    rx.el.label(
-                        rx.el.input(
-                            type="checkbox",
-                            checked=MainState.lock_aspect_ratio,
-                            on_change=MainState.set_lock_aspect_ratio,
+                    property_input(
+                        "Stroke (mm)",
+                        default_value=MainState.selected_shape["stroke_mm"].to_string(),
+                        on_change=MainState.set_shape_stroke.debounce(300),
+                        type="number",
+                        step="0.05",
+                    ),
+                    property_input(
+                        "Stroke Color",
+                        type="color",
+                        default_value=MainState.selected_shape["stroke_color"],
+                        on_change=MainState.set_shape_color.debounce(300),
+                    ),
+                    rx.el.div(
+                        rx.el.label(
+                            "Dimensions (ft)",
+                            class_name="text-sm font-medium text-neutral-600 mb-1",
+                        ),
+                        rx.el.div(
+                            dimension_input("X", "x"),
+                            dimension_input("Y", "y"),
+                            dimension_input("W", "w"),
+                            dimension_input("H", "h"),
+                            class_name="grid grid-cols-2 gap-2",
                         ),
-                        " Lock Aspect Ratio",
-                        class_name="flex items-center gap-2 text-sm font-medium text-neutral-600 cursor-pointer",
+                        class_name="mb-4",
                     ),
-                    class_name="mb-4",
-                ),
-                property_input(
-                    "Layer", default_value=MainState.selected_shape["layer"]
-                ),
-                rx.el.div(
-                    rx.el.label(
-                        rx.el.input(
-                            type="checkbox",
-                            checked=MainState.selected_shape["label_visibility"],
+                    rx.el.div(
+                        rx.el.label(
+                            rx.el.input(
+                                type="checkbox",
+                                checked=MainState.lock_aspect_ratio,
+                                on_change=MainState.set_lock_aspect_ratio,
+                            ),
+                            " Lock Aspect Ratio",
+                            class_name="flex items-center gap-2 text-sm font-medium text-neutral-600 cursor-pointer",
+                        ),
+                        class_name="mb-4",
+                    ),
+                    property_input(
+                        "Layer",
+                        default_value=MainState.selected_shape["layer"],
+                        on_blur=MainState.set_shape_layer,
+                    ),
+                    rx.el.div(
+                        rx.el.label(
+                            rx.el.input(
+                                type="checkbox",
+                                checked=MainState.selected_shape["label_visibility"],
+                                on_change=MainState.toggle_shape_labels,
+                            ),
+                            " Show Labels",
+                            class_name="flex items-center gap-2 text-sm font-medium text-neutral-600 cursor-pointer",
                         ),
-                        " Show Labels",
-                        class_name="flex items-center gap-2 text-sm font-medium text-neutral-600 cursor-pointer",
+                        class_name="mb-4",
                     ),
-                    class_name="mb-4",
+                    key=MainState.selected_shape_id,
                 ),
-            ),
-            rx.el.div(
-                rx.el.p(
-                    "No object selected.", class_name="text-sm text-neutral-500 italic"
+                rx.el.div(
+                    rx.el.p(
+                        "No object selected.",
+                        class_name="text-sm text-neutral-500 italic",
+                    ),
+                    class_name="flex items-center justify-center h-full text-center",
                 ),
-                class_name="flex items-center justify-center h-full text-center",
             ),
+            class_name="flex-1 min-h-0 overflow-y-auto",
         ),
-        class_name="w-64 bg-white p-4 border-l shadow-md",
+        layers_panel(),
+        class_name="w-64 bg-white p-4 border-l shadow-md flex flex-col",
         aria_label="Properties Panel",
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
 import reflex as rx
+from app.core.symbols import SYMBOL_LIBRARY
 from app.states.main_state import MainState
 
 
@@ -13,9 +14,74 @@ def _select_input(
     )
 
 
+def export_progress() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.div(
+                class_name="h-2 bg-orange-600 rounded-full transition-all",
+                style={"width": f"{MainState.export_progress_percent}%"},
+            ),
+            class_name="w-full h-2 bg-neutral-200 rounded-full mb-1",
+        ),
+        rx.el.p(
+            MainState.export_progress_label, class_name="text-xs text-neutral-500 mb-2"
+        ),
+        sidebar_button(
+            "Cancel Export",
+            MainState.cancel_export,
+            "circle-x",
+            class_name="!bg-gray-600 hover:!bg-gray-700",
+        ),
+        aria_label="Export Progress",
+    )
+
+
+def export_preview() -> rx.Component:
+    return rx.el.div(
+        rx.cond(
+            MainState.preview_url != "",
+            rx.el.img(
+                src=MainState.preview_url,
+                alt="Export preview",
+                class_name="w-full border border-neutral-300 bg-white",
+                style={"aspect-ratio": "1 / 1.414"},
+            ),
+            rx.el.div(
+                class_name="w-full border border-neutral-300 bg-white animate-pulse",
+                style={"aspect-ratio": "1 / 1.414"},
+            ),
+        ),
+        rx.el.div(
+            rx.el.span(
+                rx.cond(
+                    MainState.preview_dpi > 0,
+                    f"A2 preview, {MainState.preview_dpi} DPI",
+                    "Rendering preview...",
+                ),
+                class_name="text-xs text-neutral-500",
+            ),
+            rx.el.button(
+                rx.icon(
+                    "refresh-cw",
+                    class_name=rx.cond(
+                        MainState.is_preview_refining, "size-3 animate-spin", "size-3"
+                    ),
+                ),
+                on_click=MainState.refresh_preview,
+                title="Refresh Preview",
+                class_name="p-1 rounded hover:bg-neutral-200 text-neutral-500",
+            ),
+            class_name="flex items-center justify-between mt-1",
+        ),
+        class_name="mb-4",
+        aria_label="Export Preview",
+    )
+
+
 def export_panel() -> rx.Component:
     return rx.el.div(
         rx.el.h3("4. Export & Save", class_name="font-semibold mb-2 text-neutral-700"),
+        export_preview(),
         rx.el.div(
             rx.el.label("DPI:", class_name="text-sm font-medium"),
             _select_input(
@@ -32,7 +98,11 @@ def export_panel() -> rx.Component:
             ),
             class_name="mb-4",
         ),
-        sidebar_button("Export Drawing", MainState.export_drawing, "download"),
+        rx.cond(
+            MainState.is_exporting,
+            export_progress(),
+            sidebar_button("Export Drawing", MainState.export_drawing, "download"),
+        ),
         sidebar_button(
             "Save Project",
             MainState.save_project_local,
@@ -63,6 +133,52 @@ def sidebar_button(
     )
 
 
+def symbol_palette() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            *[
+                rx.el.button(
+                    rx.icon(symbol["icon"], class_name="size-5"),
+                    rx.el.span(symbol["name"], class_name="text-xs"),
+                    on_click=MainState.select_symbol(symbol["id"]),
+                    class_name=rx.cond(
+                        (MainState.active_tool == "symbol")
+                        & (MainState.active_symbol_id == symbol["id"]),
+                        "flex flex-col items-center gap-1 p-2 rounded-md bg-orange-200 text-orange-700 shadow-inner",
+                        "flex flex-col items-center gap-1 p-2 rounded-md border hover:bg-neutral-200",
+                    ),
+                    title=symbol["name"],
+                )
+                for symbol in SYMBOL_LIBRARY
+            ],
+            class_name="grid grid-cols-2 gap-2 mb-2",
+        ),
+        rx.el.button(
+            rx.icon("rotate-cw", class_name="mr-2 size-4"),
+            f"Rotate ({MainState.symbol_rotation_deg}°)",
+            on_click=MainState.rotate_symbol,
+            class_name="w-full flex items-center justify-center px-4 py-2 text-sm font-semibold text-neutral-700 bg-neutral-200 rounded-lg hover:bg-neutral-300",
+        ),
+        class_name="mt-3",
+        aria_label="Symbol Library",
+    )
+
+
+def plan_upload() -> rx.Component:
+    return rx.upload.root(
+        rx.el.div(
+            rx.icon("file-up", class_name="mr-2 size-4"),
+            "Import DXF / SVG",
+            class_name="w-full flex items-center justify-center px-4 py-2 text-sm font-semibold text-neutral-700 border border-dashed border-neutral-400 rounded-lg hover:bg-neutral-100 cursor-pointer",
+        ),
+        id="plan_upload",
+        accept={"image/svg+xml": [".svg"], "application/dxf": [".dxf"]},
+        multiple=True,
+        on_drop=MainState.handle_plan_upload(rx.upload_files(upload_id="plan_upload")),
+        class_name="mt-2",
+    )
+
+
 def sidebar() -> rx.Component:
     return rx.el.aside(
         rx.el.div(
@@ -100,6 +216,7 @@ def sidebar() -> rx.Component:
                     sidebar_button(
                         "Create Plot", MainState.create_preset_plot, "square_plus"
                     ),
+                    plan_upload(),
                     class_name="p-4 bg-neutral-50 rounded-lg border",
                 ),
                 None,
@@ -129,6 +246,7 @@ def sidebar() -> rx.Component:
                         "Add interior walls, doors, and windows.",
                         class_name="text-sm text-neutral-600",
                     ),
+                    symbol_palette(),
                     class_name="p-4 bg-neutral-50 rounded-lg border",
                 ),
                 None,
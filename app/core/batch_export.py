@@ -0,0 +1,87 @@
+"""Non-interactive batch export of saved project files.
+
+Usage::
+
+    python -m app.core.batch_export PROJECT_DIR -o OUT_DIR --dpi 300 --format png pdf
+
+Each project is rendered in a worker process with the same renderer as the
+in-app "Export Drawing" button and written to ``OUT_DIR/<name>.<format>`` as
+soon as it finishes; a timing line is printed per project.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from app.core.export import EXPORT_DPIS, EXPORT_FORMATS, render_project
+from app.core.project import PROJECT_SUFFIX, load_project
+
+
+def export_one(project_path: str, out_path: str, fmt: str, dpi: int) -> tuple[float, int]:
+    """Renders one project file to ``out_path``; returns (seconds, bytes)."""
+    start = time.perf_counter()
+    project = load_project(project_path)
+    partial = f"{out_path}.part"
+    try:
+        with open(partial, "wb") as out:
+            size = render_project(project, fmt, dpi, out)
+        os.replace(partial, out_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return time.perf_counter() - start, size
+
+
+def find_projects(project_dir: Path, recursive: bool = False) -> list[Path]:
+    pattern = f"**/*{PROJECT_SUFFIX}" if recursive else f"*{PROJECT_SUFFIX}"
+    return sorted(p for p in project_dir.glob(pattern) if p.is_file())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.batch_export",
+        description="Render saved floorplan projects to PNG/PDF.",
+    )
+    parser.add_argument("project_dir", type=Path)
+    parser.add_argument("-o", "--out-dir", type=Path, default=Path("exports"))
+    parser.add_argument("--dpi", type=int, default=300, choices=EXPORT_DPIS)
+    parser.add_argument(
+        "--format", nargs="+", default=["png"], choices=EXPORT_FORMATS, dest="formats"
+    )
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-r", "--recursive", action="store_true")
+    args = parser.parse_args(argv)
+
+    projects = find_projects(args.project_dir, args.recursive)
+    if not projects:
+        print(f"No {PROJECT_SUFFIX} projects found in {args.project_dir}", file=sys.stderr)
+        return 1
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        jobs = {}
+        for path in projects:
+            name = path.relative_to(args.project_dir).with_suffix("")
+            for fmt in args.formats:
+                out_path = args.out_dir / f"{'__'.join(name.parts)}.{fmt}"
+                future = pool.submit(export_one, str(path), str(out_path), fmt, args.dpi)
+                jobs[future] = out_path
+        for future in as_completed(jobs):
+            out_path = jobs[future]
+            try:
+                seconds, size = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {out_path.name}: {e}", file=sys.stderr)
+                continue
+            print(f"{out_path.name}\t{args.dpi} DPI\t{seconds:.2f}s\t{size / 1024:.0f} KiB")
+    elapsed = time.perf_counter() - start
+    print(f"Exported {len(jobs) - failures}/{len(jobs)} files in {elapsed:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
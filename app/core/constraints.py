@@ -0,0 +1,160 @@
+"""Local constraint solving for numeric edits to a shape's box.
+
+Editing X/Y/W/H in the properties panel maps the shape's bounding box onto
+the new one with a single affine matrix, after applying the aspect-ratio
+lock and keeping the box inside the plot. Neighbouring shapes that share a
+wall with the edited shape (a vertex on one of its vertices or edges) have
+just those vertices carried along by the same matrix, so attached walls
+stretch instead of detaching.
+
+Shapes and their neighbours are looked up through ``ShapeIndex``, a uniform
+grid over shape vertices that is updated as shapes change, so an edit only
+looks at shapes near the edited one; its cost follows the size of that
+neighbourhood, not the drawing.
+"""
+
+import math
+from typing import TYPE_CHECKING
+from app.core.geometry import bounds, point_segment_distance, polygon_area, quantize
+from app.core.models import CanvasConfig, Point, Shape
+from app.core.transform import Box, scaling, translation
+
+if TYPE_CHECKING:
+    import numpy as np
+
+INDEX_CELL_FT = 4.0
+DIMENSION_FIELDS = ("x", "y", "w", "h")
+
+
+class ShapeIndex:
+    """Shapes by id, plus a uniform grid mapping cells to the shapes with a
+    vertex in them."""
+
+    def __init__(self, shapes: list[Shape] = ()):
+        self._shapes: dict[str, Shape] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._shape_cells: dict[str, set[tuple[int, int]]] = {}
+        for shape in shapes:
+            self.add(shape)
+
+    def get(self, shape_id: str) -> Shape | None:
+        return self._shapes.get(shape_id)
+
+    @staticmethod
+    def _cell(p: Point) -> tuple[int, int]:
+        return (math.floor(p["x"] / INDEX_CELL_FT), math.floor(p["y"] / INDEX_CELL_FT))
+
+    def add(self, shape: Shape) -> None:
+        self.remove(shape["id"])
+        self._shapes[shape["id"]] = shape
+        cells = {self._cell(p) for p in shape["points"]}
+        self._shape_cells[shape["id"]] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(shape["id"])
+
+    def remove(self, shape_id: str) -> None:
+        self._shapes.pop(shape_id, None)
+        for cell in self._shape_cells.pop(shape_id, ()):
+            self._cells[cell].discard(shape_id)
+
+    def near(self, box: Box, margin: float) -> list[Shape]:
+        """Returns shapes with a vertex in the grid cells around ``box``."""
+        x0, y0, x1, y1 = box
+        i0, j0 = self._cell({"x": x0 - margin, "y": y0 - margin})
+        i1, j1 = self._cell({"x": x1 + margin, "y": y1 + margin})
+        found = set()
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                found.update(self._cells.get((i, j), ()))
+        return [self._shapes[shape_id] for shape_id in found]
+
+
+def shape_box(shape: Shape) -> Box:
+    return bounds(shape["points"])
+
+
+def constrain_box(
+    old: Box,
+    field: str,
+    value: float,
+    lock_aspect: bool = False,
+    plot: Box | None = None,
+) -> Box:
+    """Returns the box after setting one of x/y/w/h, honouring the aspect
+    lock and keeping the box inside ``plot``."""
+    x, y = old[0], old[1]
+    w, h = old[2] - old[0], old[3] - old[1]
+    if field == "x":
+        x = value
+    elif field == "y":
+        y = value
+    elif field == "w":
+        if lock_aspect and w > 0:
+            h *= value / w
+        w = value
+    elif field == "h":
+        if lock_aspect and h > 0:
+            w *= value / h
+        h = value
+    if plot is not None:
+        px0, py0, px1, py1 = plot
+        fit = min(
+            1.0, (px1 - px0) / w if w > 0 else 1.0, (py1 - py0) / h if h > 0 else 1.0
+        )
+        if fit < 1.0 and lock_aspect:
+            w, h = w * fit, h * fit
+        w, h = min(w, px1 - px0), min(h, py1 - py0)
+        x = min(max(x, px0), px1 - w)
+        y = min(max(y, py0), py1 - h)
+    return (x, y, x + w, y + h)
+
+
+def box_matrix(old: Box, new: Box) -> "np.ndarray":
+    """Returns the affine matrix mapping box ``old`` onto box ``new``."""
+    eps = CanvasConfig.COORD_PRECISION_FT
+    ow, oh = old[2] - old[0], old[3] - old[1]
+    sx = (new[2] - new[0]) / ow if ow > eps else 1.0
+    sy = (new[3] - new[1]) / oh if oh > eps else 1.0
+    return translation(new[0] - old[0], new[1] - old[1]) @ scaling(
+        sx, sy, old[0], old[1]
+    )
+
+
+def _apply(m: "np.ndarray", p: Point) -> Point:
+    return {
+        "x": quantize(m[0, 0] * p["x"] + m[0, 1] * p["y"] + m[0, 2]),
+        "y": quantize(m[1, 0] * p["x"] + m[1, 1] * p["y"] + m[1, 2]),
+    }
+
+
+def _with_points(shape: Shape, points: list[Point]) -> Shape:
+    area = polygon_area(points) if shape["is_closed"] else shape["area"]
+    return {**shape, "points": points, "area": area}
+
+
+def solve_box_edit(
+    shape: Shape,
+    new_box: Box,
+    neighbors: list[Shape],
+    tolerance: float = CanvasConfig.COORD_PRECISION_FT,
+) -> list[Shape]:
+    """Moves ``shape`` onto ``new_box`` and carries along neighbour vertices
+    that lie on its outline. Returns the edited shape followed by every
+    neighbour that changed."""
+    m = box_matrix(shape_box(shape), new_box)
+    outline = shape["points"]
+    ends = outline[1:] + outline[:1] if shape["is_closed"] else outline[1:]
+    segments = list(zip(outline, ends))
+    changed = [_with_points(shape, [_apply(m, p) for p in outline])]
+    for other in neighbors:
+        points = []
+        moved = False
+        for p in other["points"]:
+            if any(point_segment_distance(p, a, b) <= tolerance for a, b in segments):
+                points.append(_apply(m, p))
+                moved = True
+            else:
+                points.append(p)
+        if moved:
+            changed.append(_with_points(other, points))
+    return changed
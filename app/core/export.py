@@ -0,0 +1,254 @@
+"""PNG/PDF rendering of a drawing onto the A2 sheet.
+
+Shared by the interactive ``export_drawing`` handler and the batch export CLI
+so both produce identical output. PNG output is rasterised in horizontal bands
+that are compressed and written as they complete, which keeps memory bounded
+at 600 DPI; PDF output is written as vector paths.
+"""
+
+import re
+import struct
+import zlib
+from typing import BinaryIO, Callable
+from app.core.geometry import sheet_size_px, sheet_transform, stroke_px
+from app.core.models import Project, Shape
+from app.core.project import plot_dimensions, visible_shapes
+
+EXPORT_FORMATS = ("png", "pdf")
+EXPORT_DPIS = (96, 150, 300, 600)
+BAND_HEIGHT_PX = 512
+PDF_POINTS_PER_INCH = 72
+
+ProgressCallback = Callable[[int, int, int], None]
+
+_RGB_FUNC_RE = re.compile(r"^rgba?\(\s*([^)]*)\)$")
+
+
+def parse_color(value: str) -> tuple[int, int, int, int] | None:
+    """Parses ``#rgb``, ``#rrggbb``, ``rgb()``/``rgba()`` or ``transparent``
+    into an RGBA tuple, returning None for fully transparent colours."""
+    value = (value or "").strip().lower()
+    if value in ("", "none", "transparent"):
+        return None
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        if len(digits) != 6:
+            raise ValueError(f"Invalid color: {value!r}")
+        return (int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), 255)
+    match = _RGB_FUNC_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid color: {value!r}")
+    parts = [p.strip() for p in match.group(1).split(",")]
+    r, g, b = (int(float(p)) for p in parts[:3])
+    alpha = round(float(parts[3]) * 255) if len(parts) > 3 else 255
+    return None if alpha <= 0 else (r, g, b, alpha)
+
+
+def _prepare(
+    shapes: list[Shape], plot_width: float, plot_height: float, dpi: float
+) -> list[dict]:
+    """Projects shapes into sheet pixels, sorted by their top edge."""
+    scale, offset_x, offset_y = sheet_transform(plot_width, plot_height, dpi)
+    items = []
+    for shape in shapes:
+        if len(shape["points"]) < 2:
+            continue
+        points = [
+            (offset_x + p["x"] * scale, offset_y + p["y"] * scale)
+            for p in shape["points"]
+        ]
+        width = stroke_px(shape["stroke_mm"], dpi)
+        ys = [p[1] for p in points]
+        items.append(
+            {
+                "points": points,
+                "closed": shape["is_closed"],
+                "stroke": parse_color(shape["stroke_color"]),
+                "fill": parse_color(shape["fill_color"]) if shape["is_closed"] else None,
+                "width": width,
+                "top": min(ys) - width,
+                "bottom": max(ys) + width,
+            }
+        )
+    items.sort(key=lambda item: item["top"])
+    return items
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + tag
+        + data
+        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    )
+
+
+def _draw_band(draw, items: list[dict], top: int) -> None:
+    for item in items:
+        points = [(x, y - top) for x, y in item["points"]]
+        if item["fill"] and len(points) > 2:
+            draw.polygon(points, fill=item["fill"])
+        if item["stroke"]:
+            if item["closed"]:
+                points.append(points[0])
+            draw.line(
+                points,
+                fill=item["stroke"],
+                width=max(1, round(item["width"])),
+                joint="curve",
+            )
+
+
+def render_png(
+    shapes: list[Shape],
+    plot_width: float,
+    plot_height: float,
+    dpi: int,
+    out: BinaryIO,
+    band_height: int = BAND_HEIGHT_PX,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """Renders the A2 sheet as a PNG into ``out``; returns bytes written.
+
+    ``progress`` is called after each band with (bands_done, bands_total,
+    bytes_written).
+    """
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError as e:
+        raise RuntimeError("PNG export requires Pillow (pip install pillow).") from e
+    width, height = sheet_size_px(dpi)
+    items = _prepare(shapes, plot_width, plot_height, dpi)
+    pixels_per_meter = round(dpi / 0.0254)
+    written = out.write(
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+    )
+    compressor = zlib.compressobj(6)
+    stride = width * 3
+    bands_total = (height + band_height - 1) // band_height
+    active: list[dict] = []
+    next_item = 0
+    for band in range(bands_total):
+        top = band * band_height
+        rows = min(band_height, height - top)
+        bottom = top + rows
+        while next_item < len(items) and items[next_item]["top"] < bottom:
+            active.append(items[next_item])
+            next_item += 1
+        active = [item for item in active if item["bottom"] >= top]
+        image = Image.new("RGB", (width, rows), "white")
+        _draw_band(ImageDraw.Draw(image, "RGBA"), active, top)
+        raw = image.tobytes()
+        filtered = b"".join(
+            b"\x00" + raw[i * stride : (i + 1) * stride] for i in range(rows)
+        )
+        data = compressor.compress(filtered)
+        if band == bands_total - 1:
+            data += compressor.flush()
+        if data:
+            written += out.write(_png_chunk(b"IDAT", data))
+        if progress:
+            progress(band + 1, bands_total, written)
+    written += out.write(_png_chunk(b"IEND", b""))
+    return written
+
+
+def _pdf_num(value: float) -> str:
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+
+def render_pdf(
+    shapes: list[Shape],
+    plot_width: float,
+    plot_height: float,
+    dpi: int,
+    out: BinaryIO,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """Renders the A2 sheet as a single-page vector PDF; returns bytes written.
+
+    Geometry is placed with the same sheet transform as PNG export, evaluated
+    at 72 points per inch; ``dpi`` is accepted for parity with ``render_png``
+    since vector output is resolution independent.
+    """
+    page_w, page_h = sheet_size_px(PDF_POINTS_PER_INCH)
+    items = _prepare(shapes, plot_width, plot_height, PDF_POINTS_PER_INCH)
+    alphas: dict[int, str] = {}
+    ops = []
+    for item in items:
+        ops.append("q")
+        paint = ""
+        for color, key, op in ((item["fill"], "ca", "rg"), (item["stroke"], "CA", "RG")):
+            if color is None:
+                continue
+            ops.append(" ".join(_pdf_num(c / 255) for c in color[:3]) + f" {op}")
+            if color[3] < 255:
+                name = alphas.setdefault(color[3], f"GS{len(alphas)}")
+                ops.append(f"/{name}{key} gs")
+            paint += "f" if op == "rg" else "S"
+        if not paint:
+            ops.append("Q")
+            continue
+        ops.append(f"{_pdf_num(item['width'])} w 1 J 1 j")
+        path = [
+            f"{_pdf_num(x)} {_pdf_num(page_h - y)} {'m' if i == 0 else 'l'}"
+            for i, (x, y) in enumerate(item["points"])
+        ]
+        if item["closed"]:
+            path.append("h")
+        ops.append("\n".join(path))
+        ops.append({"f": "f", "S": "S", "fS": "B"}[paint])
+        ops.append("Q")
+    content = zlib.compress("\n".join(ops).encode("ascii"))
+    ext_g_states = " ".join(
+        f"/{name}ca << /ca {_pdf_num(a / 255)} >> /{name}CA << /CA {_pdf_num(a / 255)} >>"
+        for a, name in alphas.items()
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w} {page_h}] "
+            f"/Resources << /ExtGState << {ext_g_states} >> >> /Contents 4 0 R >>"
+        ).encode("ascii"),
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+        + content
+        + b"\nendstream",
+    ]
+    written = out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(written)
+        written += out.write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+        if progress:
+            progress(number, len(objects), written)
+    xref = written
+    table = [f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"]
+    table += [f"{offset:010d} 00000 n \n" for offset in offsets]
+    table.append(
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    )
+    written += out.write("".join(table).encode("ascii"))
+    return written
+
+
+def render_project(
+    project: Project,
+    fmt: str,
+    dpi: int,
+    out: BinaryIO,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """Renders a project in ``fmt`` ("png" or "pdf"); returns bytes written.
+    Shapes on hidden layers are left out."""
+    plot_width, plot_height = plot_dimensions(project)
+    shapes = visible_shapes(project)
+    if fmt == "png":
+        return render_png(shapes, plot_width, plot_height, dpi, out, progress=progress)
+    if fmt == "pdf":
+        return render_pdf(shapes, plot_width, plot_height, dpi, out, progress=progress)
+    raise ValueError(f"Unsupported export format: {fmt!r}")
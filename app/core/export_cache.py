@@ -0,0 +1,214 @@
+"""Content-addressed on-disk cache for rendered exports.
+
+Entries are keyed by a hash of the render-relevant parts of a project plus the
+export settings, so re-exporting an unchanged drawing is a file lookup. The
+cache is bounded by total size and evicts least-recently-used entries; file
+mtimes record recency so the order survives process restarts.
+
+Several worker processes may share one cache directory. Each keeps an index
+of what it has seen, and re-scans the directory before evicting so the size
+bound holds for everything on disk, not just the entries it wrote.
+
+Every lookup logs the cache's running hit/miss stats at INFO level.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Callable
+from app.core.models import CanvasConfig, Project
+from app.core.project import plot_dimensions, visible_shapes
+
+RENDERER_VERSION = 1
+DEFAULT_MAX_BYTES = (
+    int(os.environ.get("FLOORPLAN_EXPORT_CACHE_MB", "512")) * 1024 * 1024
+)
+COORD_DIGITS = 6
+STALE_PART_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(project: Project, fmt: str, dpi: int) -> str:
+    """Hashes the normalized shapes, plot size, export settings and sheet
+    configuration. Ids, layer names and label flags do not affect the
+    rendered output and are left out; hidden layers are excluded."""
+    plot_width, plot_height = plot_dimensions(project)
+    shapes = [
+        (
+            shape["type"],
+            [
+                (round(p["x"], COORD_DIGITS), round(p["y"], COORD_DIGITS))
+                for p in shape["points"]
+            ],
+            shape["stroke_mm"],
+            shape["stroke_color"].strip().lower(),
+            shape["fill_color"].strip().lower(),
+            shape["is_closed"],
+        )
+        for shape in visible_shapes(project)
+    ]
+    payload = {
+        "renderer": RENDERER_VERSION,
+        "format": fmt,
+        "dpi": int(dpi),
+        "sheet": [
+            CanvasConfig.A2_WIDTH_FT,
+            CanvasConfig.A2_HEIGHT_FT,
+            CanvasConfig.PLOT_SCALE,
+        ],
+        "plot": [plot_width, plot_height],
+        "shapes": shapes,
+    }
+    encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ExportCache:
+    """Size-bounded LRU cache of export files under ``directory``."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        """Rebuilds the index from the files on disk, oldest mtime first.
+        Partial files are left to their writers unless they are stale."""
+        found = []
+        stale = time.time() - STALE_PART_SECONDS
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == ".part":
+                if stat.st_mtime < stale:
+                    path.unlink(missing_ok=True)
+                continue
+            found.append((stat.st_mtime, self._relpath(path), stat.st_size))
+        self._entries = OrderedDict((rel, size) for _, rel, size in sorted(found))
+        self._total_bytes = sum(self._entries.values())
+
+    def _relpath(self, path: Path) -> str:
+        return path.relative_to(self.directory).as_posix()
+
+    def relpath(self, key: str, fmt: str) -> str:
+        """Returns the entry path relative to the cache directory."""
+        return f"{key[:2]}/{key}.{fmt}"
+
+    def contains(self, key: str, fmt: str) -> bool:
+        """Whether the entry exists, without counting a lookup or refreshing
+        its recency."""
+        return (self.directory / self.relpath(key, fmt)).exists()
+
+    def get(self, key: str, fmt: str) -> Path | None:
+        rel = self.relpath(key, fmt)
+        path = self.directory / rel
+        try:
+            # The mtime is the recency every process sees; an entry evicted
+            # by another worker in the meantime is a miss.
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(rel, 0)
+                self.misses += 1
+            self._log_lookup("miss", rel)
+            return None
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(rel, 0)
+            self._entries[rel] = size
+            self.hits += 1
+        self._log_lookup("hit", rel)
+        return path
+
+    def _log_lookup(self, outcome: str, rel: str) -> None:
+        stats = self.stats()
+        logger.info(
+            "%s %s %s: %d hits, %d misses (%.0f%% hit rate), %d entries, "
+            "%.1f/%.1f MiB, %d evictions",
+            self.directory.name,
+            outcome,
+            rel,
+            stats["hits"],
+            stats["misses"],
+            stats["hit_rate"] * 100,
+            stats["entries"],
+            stats["bytes"] / 1024**2,
+            stats["max_bytes"] / 1024**2,
+            stats["evictions"],
+        )
+
+    def put(self, key: str, fmt: str, render: Callable[[BinaryIO], int]) -> Path:
+        """Writes an entry via ``render(out)`` and evicts down to ``max_bytes``
+        across everything in the directory."""
+        rel = self.relpath(key, fmt)
+        path = self.directory / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.part"
+        )
+        try:
+            with open(partial, "wb") as out:
+                render(out)
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+        with self._lock:
+            # Other workers may have written entries since the last scan.
+            self._scan()
+            self._evict(keep=rel)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            rel, size = next(iter(self._entries.items()))
+            if rel == keep:
+                self._entries.move_to_end(rel)
+                continue
+            del self._entries[rel]
+            self._total_bytes -= size
+            self.evictions += 1
+            (self.directory / rel).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_default_caches: dict[Path, ExportCache] = {}
+_default_lock = threading.Lock()
+
+
+def get_export_cache(
+    directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES
+) -> ExportCache:
+    """Returns the process-wide cache for ``directory``; ``max_bytes`` applies
+    when the cache is first created."""
+    directory = Path(directory).resolve()
+    with _default_lock:
+        if directory not in _default_caches:
+            _default_caches[directory] = ExportCache(directory, max_bytes)
+        return _default_caches[directory]
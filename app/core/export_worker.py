@@ -0,0 +1,105 @@
+"""Bounded background execution of export renders.
+
+Renders run on a small shared thread pool so a slow 600 DPI export never
+blocks a session's event processing. The heavy parts of rendering (Pillow
+rasterisation and zlib compression) run in C and release the GIL, so worker
+threads do not starve the event loop, and progress/cancellation can be
+exchanged in-process without IPC. A bounded number of jobs may be queued
+across all sessions; further submissions are rejected rather than piling up.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from app.core.export import ProgressCallback
+
+DEFAULT_WORKERS = int(os.environ.get("FLOORPLAN_EXPORT_WORKERS", "2"))
+DEFAULT_MAX_PENDING = int(os.environ.get("FLOORPLAN_EXPORT_QUEUE", "8"))
+
+
+class ExportCancelled(Exception):
+    """Raised inside a render when its job has been cancelled."""
+
+
+class ExportQueueFull(Exception):
+    """Raised when the export queue has no free slots."""
+
+
+class ExportJob:
+    """Handle for a submitted export: progress snapshot, cancel, result."""
+
+    def __init__(self):
+        self.future: Future | None = None
+        self.units_done = 0
+        self.units_total = 0
+        self.bytes_written = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def _progress(self, done: int, total: int, written: int) -> None:
+        if self._cancelled.is_set():
+            raise ExportCancelled()
+        self.units_done, self.units_total, self.bytes_written = done, total, written
+
+
+class ExportQueue:
+    def __init__(
+        self, max_workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="export"
+        )
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+
+    def submit(self, render: Callable[[ProgressCallback], Any]) -> ExportJob:
+        """Queues ``render(progress)``; raises ExportQueueFull when saturated.
+
+        ``render`` must pass ``progress`` down to the renderer so the job can
+        report progress and be cancelled between bands.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ExportQueueFull()
+        job = ExportJob()
+
+        def run():
+            try:
+                if job.cancelled:
+                    raise ExportCancelled()
+                return render(job._progress)
+            finally:
+                self._slots.release()
+
+        try:
+            job.future = self._executor.submit(run)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        job.future.add_done_callback(
+            lambda f: self._slots.release() if f.cancelled() else None
+        )
+        return job
+
+
+_queue: ExportQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_export_queue() -> ExportQueue:
+    """Returns the process-wide export queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportQueue()
+        return _queue
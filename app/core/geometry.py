@@ -0,0 +1,282 @@
+import math
+from app.core.models import CanvasConfig, Point, Shape, ViewTransform
+
+
+def polygon_area(points: list[Point]) -> float:
+    """Returns the unsigned area of a closed polygon (shoelace formula)."""
+    n = len(points)
+    if n < 3:
+        return 0.0
+    total = 0.0
+    prev = points[-1]
+    for p in points:
+        total += prev["x"] * p["y"] - p["x"] * prev["y"]
+        prev = p
+    return abs(total) / 2.0
+
+
+def bounds(points: list[Point]) -> tuple[float, float, float, float]:
+    """Returns (min_x, min_y, max_x, max_y) of a point list."""
+    xs = [p["x"] for p in points]
+    ys = [p["y"] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def point_segment_distance(p: Point, a: Point, b: Point) -> float:
+    dx = b["x"] - a["x"]
+    dy = b["y"] - a["y"]
+    if dx == 0 and dy == 0:
+        return math.hypot(p["x"] - a["x"], p["y"] - a["y"])
+    t = ((p["x"] - a["x"]) * dx + (p["y"] - a["y"]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(p["x"] - (a["x"] + t * dx), p["y"] - (a["y"] + t * dy))
+
+
+def simplify_rdp(points: list[Point], epsilon: float) -> list[Point]:
+    """Ramer-Douglas-Peucker simplification.
+
+    Iterative so long freehand strokes and flattened curves do not hit the
+    recursion limit.
+    """
+    n = len(points)
+    if n < 3 or epsilon <= 0:
+        return list(points)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist = 0.0
+        index = start
+        for i in range(start + 1, end):
+            d = point_segment_distance(points[i], points[start], points[end])
+            if d > max_dist:
+                max_dist = d
+                index = i
+        if max_dist > epsilon:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def point_in_polygon(p: Point, points: list[Point]) -> bool:
+    """Even-odd ray casting test."""
+    inside = False
+    prev = points[-1]
+    for cur in points:
+        if (cur["y"] > p["y"]) != (prev["y"] > p["y"]):
+            x_cross = cur["x"] + (p["y"] - cur["y"]) * (prev["x"] - cur["x"]) / (
+                prev["y"] - cur["y"]
+            )
+            if p["x"] < x_cross:
+                inside = not inside
+        prev = cur
+    return inside
+
+
+def hit_test(shapes: list[Shape], p: Point, tolerance: float) -> Shape | None:
+    """Returns the topmost shape whose outline lies within ``tolerance`` of
+    ``p``, or whose filled interior contains it."""
+    for shape in reversed(shapes):
+        points = shape["points"]
+        if len(points) < 2:
+            continue
+        min_x, min_y, max_x, max_y = bounds(points)
+        if (
+            p["x"] < min_x - tolerance
+            or p["x"] > max_x + tolerance
+            or p["y"] < min_y - tolerance
+            or p["y"] > max_y + tolerance
+        ):
+            continue
+        edges = zip(
+            points, points[1:] + points[:1] if shape["is_closed"] else points[1:]
+        )
+        if any(point_segment_distance(p, a, b) <= tolerance for a, b in edges):
+            return shape
+        if (
+            shape["is_closed"]
+            and shape["fill_color"] != "transparent"
+            and len(points) > 2
+            and point_in_polygon(p, points)
+        ):
+            return shape
+    return None
+
+
+def snap_to_vertex(shapes: list[Shape], p: Point, threshold: float) -> Point:
+    """Returns the nearest shape vertex within ``threshold`` of ``p``, or ``p``."""
+    best = p
+    best_dist = threshold
+    for shape in shapes:
+        for v in shape["points"]:
+            dx = v["x"] - p["x"]
+            dy = v["y"] - p["y"]
+            if abs(dx) > best_dist or abs(dy) > best_dist:
+                continue
+            dist = math.hypot(dx, dy)
+            if dist <= best_dist:
+                best, best_dist = v, dist
+    return {"x": best["x"], "y": best["y"]}
+
+
+def arc_points(
+    cx: float,
+    cy: float,
+    radius: float,
+    start_deg: float,
+    end_deg: float,
+    segments_per_circle: int = 64,
+) -> list[Point]:
+    """Flattens a counter-clockwise circular arc into a polyline."""
+    sweep = (end_deg - start_deg) % 360.0
+    if sweep == 0:
+        sweep = 360.0
+    steps = max(2, int(math.ceil(segments_per_circle * sweep / 360.0)))
+    start = math.radians(start_deg)
+    step = math.radians(sweep) / steps
+    return [
+        {
+            "x": cx + radius * math.cos(start + i * step),
+            "y": cy + radius * math.sin(start + i * step),
+        }
+        for i in range(steps + 1)
+    ]
+
+
+def precision_digits(precision: float) -> int:
+    """Returns the decimal places needed to represent multiples of ``precision``."""
+    digits = 0
+    while digits < 12 and abs(round(precision, digits) - precision) > precision * 1e-9:
+        digits += 1
+    return digits
+
+
+def quantize(value: float, precision: float = CanvasConfig.COORD_PRECISION_FT) -> float:
+    """Snaps a coordinate to the nearest multiple of ``precision``.
+
+    The result is rounded to the precision's decimal places so it has a short
+    float repr (``23.457`` rather than ``23.457000000000001``).
+    """
+    return round(round(value / precision) * precision, precision_digits(precision))
+
+
+def quantize_point(
+    p: Point, precision: float = CanvasConfig.COORD_PRECISION_FT
+) -> Point:
+    return {"x": quantize(p["x"], precision), "y": quantize(p["y"], precision)}
+
+
+def _format_number(value: float, digits: int) -> str:
+    """Shortest fixed-precision form: no trailing zeros, no leading ``0``
+    before the decimal point (``-0.25`` -> ``-.25``)."""
+    text = f"{value:.{digits}f}"
+    if digits:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def _join_numbers(numbers: list[str]) -> str:
+    """Joins SVG numbers, dropping the separator where a minus sign already
+    delimits them."""
+    parts = [numbers[0]]
+    for n in numbers[1:]:
+        parts.append(n if n.startswith("-") else f" {n}")
+    return "".join(parts)
+
+
+def format_points(
+    points: list[Point], precision: float = CanvasConfig.COORD_PRECISION_FT
+) -> str:
+    """Formats a point list for an SVG ``points`` attribute with no more
+    decimal places than the world precision."""
+    digits = precision_digits(precision)
+    return " ".join(
+        [
+            f"{_format_number(p['x'], digits)},{_format_number(p['y'], digits)}"
+            for p in points
+        ]
+    )
+
+
+def format_path(
+    points: list[Point],
+    precision: float = CanvasConfig.COORD_PRECISION_FT,
+    relative: bool = True,
+) -> str:
+    """Formats a point list as SVG path data.
+
+    With ``relative`` each vertex after the first is written as an offset
+    from the previous one (``l dx dy``); freehand strokes are made of many
+    short steps, so the offsets are much shorter than absolute coordinates.
+    Offsets are taken between quantized points, so rounding error does not
+    accumulate along the path.
+    """
+    if not points:
+        return ""
+    digits = precision_digits(precision)
+    quantized = [quantize_point(p, precision) for p in points]
+    first = quantized[0]
+    head = f"M{_format_number(first['x'], digits)},{_format_number(first['y'], digits)}"
+    if len(quantized) == 1:
+        return head
+    if not relative:
+        return f"{head}L{format_points(quantized[1:], precision)}"
+    steps = []
+    prev = first
+    for p in quantized[1:]:
+        steps.append(_format_number(p["x"] - prev["x"], digits))
+        steps.append(_format_number(p["y"] - prev["y"], digits))
+        prev = p
+    return f"{head}l{_join_numbers(steps)}"
+
+
+def plot_viewbox(
+    plot_width: float, plot_height: float, view: ViewTransform
+) -> tuple[float, float, float, float]:
+    """Returns the (x, y, w, h) editing viewBox: the plot plus 10% padding,
+    zoomed and panned by the view transform."""
+    padding_x = plot_width * 0.1
+    padding_y = plot_height * 0.1
+    base_w = plot_width + 2 * padding_x
+    base_h = plot_height + 2 * padding_y
+    return (
+        -padding_x + view["offset_x"],
+        -padding_y + view["offset_y"],
+        base_w / view["scale"],
+        base_h / view["scale"],
+    )
+
+
+def sheet_size_px(dpi: float) -> tuple[int, int]:
+    """Returns the A2 sheet size in pixels at the given DPI."""
+    return (
+        round(CanvasConfig.A2_WIDTH_FT * 12 * dpi),
+        round(CanvasConfig.A2_HEIGHT_FT * 12 * dpi),
+    )
+
+
+def stroke_px(stroke_mm: float, dpi: float) -> float:
+    """Converts a physical stroke weight to export pixels."""
+    return stroke_mm / CanvasConfig.MM_PER_INCH * dpi
+
+
+def sheet_transform(
+    plot_width: float, plot_height: float, dpi: float
+) -> tuple[float, float, float]:
+    """Returns (pixels_per_foot, offset_x, offset_y) mapping world feet onto the
+    A2 sheet at ``dpi`` with the plot centred, per PLOT_SCALE."""
+    scale = dpi / CanvasConfig.PLOT_SCALE
+    sheet_w, sheet_h = sheet_size_px(dpi)
+    return (
+        scale,
+        (sheet_w - plot_width * scale) / 2,
+        (sheet_h - plot_height * scale) / 2,
+    )
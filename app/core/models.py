@@ -0,0 +1,79 @@
+from typing import TypedDict, Literal
+
+
+class Point(TypedDict):
+    x: float
+    y: float
+
+
+class Shape(TypedDict):
+    id: str
+    type: Literal["rectangle", "polygon", "line", "freehand"]
+    points: list[Point]
+    stroke_mm: float
+    stroke_color: str
+    fill_color: str
+    layer: str
+    label_visibility: bool
+    is_closed: bool
+    area: float
+
+
+class SymbolInstance(TypedDict):
+    id: str
+    symbol_id: str
+    x: float
+    y: float
+    rotation_deg: float
+    scale_x: float
+    scale_y: float
+    layer: str
+
+
+class Room(TypedDict):
+    id: str
+    points: list[Point]
+    area: float
+    centroid: Point
+
+
+class TransformHandle(TypedDict):
+    name: str
+    x: float
+    y: float
+    size: float
+    cursor: str
+
+
+class Layer(TypedDict):
+    name: str
+    visible: bool
+    locked: bool
+
+
+class ViewTransform(TypedDict):
+    scale: float
+    offset_x: float
+    offset_y: float
+
+
+class CanvasConfig:
+    A2_WIDTH_FT = 1.378333
+    A2_HEIGHT_FT = 1.949167
+    PLOT_SCALE = 3.1
+    MM_PER_INCH = 25.4
+    SNAP_THRESHOLD_FT = 0.5
+    HIT_TOLERANCE_FT = 0.3
+    HANDLE_SIZE_FT = 0.6
+    COORD_PRECISION_FT = 0.001
+    DELTA_ENCODE_MIN_POINTS = 16
+    EDITING_DPI = 96
+
+
+class Project(TypedDict):
+    version: int
+    plot_width_ft: str
+    plot_height_ft: str
+    shapes: list[Shape]
+    layers: list[Layer]
+    symbols: list[SymbolInstance]
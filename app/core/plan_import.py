@@ -0,0 +1,738 @@
+"""Streaming DXF/SVG importer that turns plan entities into world-feet shapes.
+
+Both readers walk the source file incrementally (DXF group-code pairs, SVG
+``iterparse`` events) and only keep the entity currently being assembled, so
+memory use is bounded by the size of the largest single entity plus the
+resulting shape list.
+"""
+
+import abc
+import io
+import math
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import IO, Iterator
+from app.core.geometry import (
+    arc_points,
+    bounds,
+    polygon_area,
+    quantize_point,
+    simplify_rdp,
+)
+from app.core.models import Point, Shape
+
+FEET_PER_UNIT = {
+    "in": 1 / 12,
+    "ft": 1.0,
+    "yd": 3.0,
+    "mi": 5280.0,
+    "mm": 1 / 304.8,
+    "cm": 1 / 30.48,
+    "m": 1 / 0.3048,
+    "pt": 1 / 864,
+    "pc": 1 / 72,
+    "px": 1 / 1152,
+}
+DXF_INSUNITS = {1: "in", 2: "ft", 3: "mi", 4: "mm", 5: "cm", 6: "m", 10: "yd"}
+DEFAULT_TOLERANCE_FT = 0.02
+CURVE_SEGMENTS = 16
+ARC_SEGMENTS_PER_CIRCLE = 64
+SUPPORTED_FORMATS = ("dxf", "svg")
+
+
+def detect_format(filename: str) -> str:
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported plan format: {filename!r}")
+    return ext
+
+
+class _ShapeFactory:
+    def __init__(self, layer: str, tolerance_ft: float):
+        self.layer = layer
+        self.tolerance_ft = tolerance_ft
+        self.stamp = int(time.time() * 1000000)
+        self.count = 0
+
+    def make(self, points: list[Point], is_closed: bool) -> Shape | None:
+        if is_closed and len(points) > 1 and points[0] == points[-1]:
+            points = points[:-1]
+        if len(points) > 2:
+            points = simplify_rdp(points, self.tolerance_ft)
+        points = [quantize_point(p) for p in points]
+        if len(points) < 2 or (is_closed and len(points) < 3):
+            return None
+        if is_closed:
+            shape_type = "polygon"
+        elif len(points) == 2:
+            shape_type = "line"
+        else:
+            shape_type = "freehand"
+        self.count += 1
+        return {
+            "id": f"import_{self.stamp}_{self.count}",
+            "type": shape_type,
+            "points": points,
+            "stroke_mm": 0.25,
+            "stroke_color": "#1a1a1a",
+            "fill_color": "transparent",
+            "layer": self.layer,
+            "label_visibility": False,
+            "is_closed": is_closed,
+            "area": polygon_area(points) if is_closed else 0.0,
+        }
+
+
+class PlanReader(abc.ABC):
+    """Base class for streaming plan readers.
+
+    Iterating a reader yields shapes; ``units``, ``entities_read`` and
+    ``entities_skipped`` are filled in as the file is consumed.
+    """
+
+    def __init__(
+        self,
+        source: IO,
+        units: str | None = None,
+        tolerance_ft: float = DEFAULT_TOLERANCE_FT,
+        layer: str = "import",
+    ):
+        if units is not None and units not in FEET_PER_UNIT:
+            raise ValueError(f"Unknown unit: {units!r}")
+        self.source = source
+        self.units = units
+        self.forced_units = units is not None
+        self.entities_read = 0
+        self.entities_skipped = 0
+        self._factory = _ShapeFactory(layer, tolerance_ft)
+
+    @property
+    def scale(self) -> float:
+        return FEET_PER_UNIT[self.units or "ft"]
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[Shape]: ...
+
+
+class DXFReader(PlanReader):
+    """Reads LINE, LWPOLYLINE, POLYLINE, CIRCLE, ARC and SPLINE entities from
+    an ASCII DXF stream. DXF is y-up, so y is negated into canvas space."""
+
+    def _pairs(self) -> Iterator[tuple[int, str]]:
+        stream = self.source
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+        while True:
+            code = stream.readline()
+            value = stream.readline()
+            if not code or not value:
+                return
+            try:
+                yield int(code.strip()), value.strip()
+            except ValueError:
+                return
+
+    def _point(self, x: float, y: float) -> Point:
+        return {"x": x * self.scale, "y": -y * self.scale}
+
+    def __iter__(self) -> Iterator[Shape]:
+        section = None
+        header_var = None
+        entity_type = None
+        entity: list[tuple[int, str]] = []
+        polyline: dict | None = None
+        for code, value in self._pairs():
+            if code == 0:
+                if entity_type is not None:
+                    if entity_type == "VERTEX" and polyline is not None:
+                        vertex = dict(entity)
+                        polyline["vertices"].append(
+                            (
+                                float(vertex.get(10, 0)),
+                                float(vertex.get(20, 0)),
+                                float(vertex.get(42, 0)),
+                            )
+                        )
+                    elif entity_type == "POLYLINE":
+                        flags = int(dict(entity).get(70, 0))
+                        polyline = {"vertices": [], "closed": bool(flags & 1)}
+                    else:
+                        shape = self._entity_to_shape(entity_type, entity)
+                        if shape is not None:
+                            yield shape
+                    entity_type = None
+                    entity = []
+                if value == "SEQEND" and polyline is not None:
+                    self.entities_read += 1
+                    raw = _bulged_points(polyline["vertices"], polyline["closed"])
+                    points = [self._point(x, y) for x, y in raw]
+                    shape = self._factory.make(points, polyline["closed"])
+                    if shape is None:
+                        self.entities_skipped += 1
+                    else:
+                        yield shape
+                    polyline = None
+                elif value == "SECTION":
+                    section = None
+                elif value == "ENDSEC":
+                    section = None
+                elif section == "ENTITIES" and value != "EOF":
+                    entity_type = value
+                continue
+            if section is None and code == 2:
+                section = value
+            elif section == "HEADER":
+                if code == 9:
+                    header_var = value
+                elif header_var == "$INSUNITS" and code == 70:
+                    if not self.forced_units:
+                        self.units = DXF_INSUNITS.get(int(value), self.units)
+                    header_var = None
+            elif entity_type is not None:
+                entity.append((code, value))
+        if entity_type is not None:
+            shape = self._entity_to_shape(entity_type, entity)
+            if shape is not None:
+                yield shape
+
+    def _entity_to_shape(
+        self, entity_type: str, pairs: list[tuple[int, str]]
+    ) -> Shape | None:
+        self.entities_read += 1
+        try:
+            points, closed = self._entity_points(entity_type, pairs)
+        except (ValueError, KeyError):
+            points, closed = [], False
+        shape = self._factory.make(points, closed) if points else None
+        if shape is None:
+            self.entities_skipped += 1
+        return shape
+
+    def _entity_points(
+        self, entity_type: str, pairs: list[tuple[int, str]]
+    ) -> tuple[list[Point], bool]:
+        if entity_type == "LINE":
+            g = dict(pairs)
+            return [
+                self._point(float(g[10]), float(g[20])),
+                self._point(float(g[11]), float(g[21])),
+            ], False
+        if entity_type == "LWPOLYLINE":
+            closed = bool(int(dict(pairs).get(70, 0)) & 1)
+            raw = _lwpolyline_points(pairs, closed)
+            return [self._point(x, y) for x, y in raw], closed
+        if entity_type == "SPLINE":
+            closed = bool(int(dict(pairs).get(70, 0)) & 1)
+            return [self._point(x, y) for x, y in _spline_points(pairs)], closed
+        if entity_type in ("CIRCLE", "ARC"):
+            g = dict(pairs)
+            cx, cy, r = float(g[10]), float(g[20]), float(g[40])
+            if entity_type == "CIRCLE":
+                raw = arc_points(cx, cy, r, 0.0, 360.0)[:-1]
+            else:
+                raw = arc_points(cx, cy, r, float(g[50]), float(g[51]))
+            return [self._point(p["x"], p["y"]) for p in raw], entity_type == "CIRCLE"
+        return [], False
+
+
+def _bulge_arc(
+    p0: tuple[float, float], p1: tuple[float, float], bulge: float
+) -> list[tuple[float, float]]:
+    """Flattens a DXF bulge segment (bulge = tan(included angle / 4), positive
+    counter-clockwise) into points after ``p0``, ending at ``p1``."""
+    dx, dy = p1[0] - p0[0], p1[1] - p0[1]
+    chord = math.hypot(dx, dy)
+    if bulge == 0 or chord == 0:
+        return [p1]
+    theta = 4 * math.atan(bulge)
+    # Centre sits on the chord's perpendicular bisector, left of p0->p1 for
+    # counter-clockwise arcs under a half circle.
+    offset = chord / 2 / math.tan(theta / 2)
+    cx = (p0[0] + p1[0]) / 2 - dy / chord * offset
+    cy = (p0[1] + p1[1]) / 2 + dx / chord * offset
+    radius = math.hypot(p0[0] - cx, p0[1] - cy)
+    start = math.atan2(p0[1] - cy, p0[0] - cx)
+    steps = max(2, math.ceil(ARC_SEGMENTS_PER_CIRCLE * abs(theta) / (2 * math.pi)))
+    out = [
+        (
+            cx + radius * math.cos(start + theta * i / steps),
+            cy + radius * math.sin(start + theta * i / steps),
+        )
+        for i in range(1, steps)
+    ]
+    out.append(p1)
+    return out
+
+
+def _lwpolyline_points(
+    pairs: list[tuple[int, str]], closed: bool
+) -> list[tuple[float, float]]:
+    """Returns LWPOLYLINE vertices with bulged segments flattened to arcs."""
+    vertices: list[list[float]] = []
+    for code, value in pairs:
+        if code == 10:
+            vertices.append([float(value), 0.0, 0.0])
+        elif vertices and code == 20:
+            vertices[-1][1] = float(value)
+        elif vertices and code == 42:
+            vertices[-1][2] = float(value)
+    return _bulged_points(vertices, closed)
+
+
+def _bulged_points(vertices: list, closed: bool) -> list[tuple[float, float]]:
+    """Flattens (x, y, bulge) polyline vertices, where each bulge applies to
+    the segment leaving its vertex."""
+    if not vertices:
+        return []
+    ends = vertices[1:] + (vertices[:1] if closed else [])
+    out = [(vertices[0][0], vertices[0][1])]
+    for (x0, y0, bulge), (x1, y1, _) in zip(vertices, ends):
+        out.extend(_bulge_arc((x0, y0), (x1, y1), bulge))
+    return out
+
+
+def _spline_points(pairs: list[tuple[int, str]]) -> list[tuple[float, float]]:
+    """Evaluates a DXF SPLINE (a NURBS curve) into a polyline, sampling
+    CURVE_SEGMENTS points per knot span with de Boor's algorithm.
+
+    A spline without a usable knot vector falls back to its fit points, or
+    to its control polygon, and is logged as approximated.
+    """
+    g = dict(pairs)
+    degree = int(g.get(71, 3))
+    knots = [float(v) for c, v in pairs if c == 40]
+    weights = [float(v) for c, v in pairs if c == 41]
+    ctrl = list(
+        zip(
+            [float(v) for c, v in pairs if c == 10],
+            [float(v) for c, v in pairs if c == 20],
+        )
+    )
+    if len(weights) != len(ctrl):
+        weights = [1.0] * len(ctrl)
+    n = len(ctrl)
+    if degree < 1 or n <= degree or len(knots) != n + degree + 1:
+        fit = list(
+            zip(
+                [float(v) for c, v in pairs if c == 11],
+                [float(v) for c, v in pairs if c == 21],
+            )
+        )
+        import logging
+
+        logging.warning(
+            "SPLINE without a valid knot vector approximated by its "
+            f"{'fit points' if fit else 'control polygon'}"
+        )
+        return fit or ctrl
+    # Homogeneous control points so rational splines evaluate exactly.
+    hom = [(x * w, y * w, w) for (x, y), w in zip(ctrl, weights)]
+    out = []
+    for span in range(degree, n):
+        u0, u1 = knots[span], knots[span + 1]
+        if u1 <= u0:
+            continue
+        first = not out
+        for i in range(0 if first else 1, CURVE_SEGMENTS + 1):
+            u = u0 + (u1 - u0) * i / CURVE_SEGMENTS
+            d = [list(hom[j + span - degree]) for j in range(degree + 1)]
+            for r in range(1, degree + 1):
+                for j in range(degree, r - 1, -1):
+                    k = j + span - degree
+                    denom = knots[k + degree + 1 - r] - knots[k]
+                    a = (u - knots[k]) / denom if denom else 0.0
+                    d[j] = [(1 - a) * d[j - 1][t] + a * d[j][t] for t in range(3)]
+            x, y, w = d[degree]
+            out.append((x / w, y / w) if w else (x, y))
+    return out
+
+
+_TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_NUMBER_RE = r"[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?"
+_PATH_TOKEN_RE = re.compile(rf"[MmLlHhVvCcSsQqTtAaZz]|{_NUMBER_RE}")
+_LENGTH_RE = re.compile(rf"^\s*({_NUMBER_RE})\s*([a-z%]*)\s*$")
+_BASIC_SHAPES = {"line", "rect", "circle", "ellipse"}
+_LENGTH_AXES = {
+    "x1": "x",
+    "y1": "y",
+    "x2": "x",
+    "y2": "y",
+    "x": "x",
+    "y": "y",
+    "width": "x",
+    "height": "y",
+    "cx": "x",
+    "cy": "y",
+    "rx": "x",
+    "ry": "y",
+    "r": "xy",
+}
+_SKIPPED_CONTAINERS = {"defs", "symbol", "clipPath", "mask", "pattern", "marker"}
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+Matrix = tuple[float, float, float, float, float, float]
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + c * b2,
+        b * a2 + d * b2,
+        a * c2 + c * d2,
+        b * c2 + d * d2,
+        a * e2 + c * f2 + e,
+        b * e2 + d * f2 + f,
+    )
+
+
+def _parse_transform(value: str | None) -> Matrix:
+    matrix = _IDENTITY
+    if not value:
+        return matrix
+    for name, args in _TRANSFORM_RE.findall(value):
+        v = [float(n) for n in re.findall(_NUMBER_RE, args)]
+        if name == "matrix" and len(v) == 6:
+            m = tuple(v)
+        elif name == "translate" and v:
+            m = (1.0, 0.0, 0.0, 1.0, v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale" and v:
+            m = (v[0], 0.0, 0.0, v[1] if len(v) > 1 else v[0], 0.0, 0.0)
+        elif name == "rotate" and v:
+            t = math.radians(v[0])
+            cos_t, sin_t = math.cos(t), math.sin(t)
+            m = (cos_t, sin_t, -sin_t, cos_t, 0.0, 0.0)
+            if len(v) == 3:
+                m = _multiply(
+                    _multiply((1.0, 0.0, 0.0, 1.0, v[1], v[2]), m),
+                    (1.0, 0.0, 0.0, 1.0, -v[1], -v[2]),
+                )
+        elif name == "skewX" and v:
+            m = (1.0, 0.0, math.tan(math.radians(v[0])), 1.0, 0.0, 0.0)
+        elif name == "skewY" and v:
+            m = (1.0, math.tan(math.radians(v[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            continue
+        matrix = _multiply(matrix, m)
+    return matrix
+
+
+def _cubic(p0, p1, p2, p3) -> list[tuple[float, float]]:
+    out = []
+    for i in range(1, CURVE_SEGMENTS + 1):
+        t = i / CURVE_SEGMENTS
+        mt = 1 - t
+        out.append(
+            (
+                mt**3 * p0[0] + 3 * mt**2 * t * p1[0] + 3 * mt * t**2 * p2[0] + t**3 * p3[0],
+                mt**3 * p0[1] + 3 * mt**2 * t * p1[1] + 3 * mt * t**2 * p2[1] + t**3 * p3[1],
+            )
+        )
+    return out
+
+
+def _quadratic(p0, p1, p2) -> list[tuple[float, float]]:
+    return _cubic(
+        p0,
+        (p0[0] + 2 / 3 * (p1[0] - p0[0]), p0[1] + 2 / 3 * (p1[1] - p0[1])),
+        (p2[0] + 2 / 3 * (p1[0] - p2[0]), p2[1] + 2 / 3 * (p1[1] - p2[1])),
+        p2,
+    )
+
+
+def _arc(p0, rx, ry, phi_deg, large_arc, sweep, p1) -> list[tuple[float, float]]:
+    """Endpoint-parameterised elliptical arc (SVG spec, appendix B.2.4)."""
+    if rx == 0 or ry == 0 or p0 == p1:
+        return [p1]
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(phi_deg)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1 = cos_phi * dx + sin_phi * dy
+    y1 = -sin_phi * dx + cos_phi * dy
+    lam = x1**2 / rx**2 + y1**2 / ry**2
+    if lam > 1:
+        rx, ry = rx * math.sqrt(lam), ry * math.sqrt(lam)
+    num = rx**2 * ry**2 - rx**2 * y1**2 - ry**2 * x1**2
+    den = rx**2 * y1**2 + ry**2 * x1**2
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cx1, cy1 = coef * rx * y1 / ry, -coef * ry * x1 / rx
+    cx = cos_phi * cx1 - sin_phi * cy1 + (p0[0] + p1[0]) / 2
+    cy = sin_phi * cx1 + cos_phi * cy1 + (p0[1] + p1[1]) / 2
+    theta1 = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    theta2 = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx)
+    delta = theta2 - theta1
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    steps = max(2, int(math.ceil(CURVE_SEGMENTS * abs(delta) / (math.pi / 2))))
+    out = []
+    for i in range(1, steps + 1):
+        t = theta1 + delta * i / steps
+        out.append(
+            (
+                cx + rx * math.cos(t) * cos_phi - ry * math.sin(t) * sin_phi,
+                cy + rx * math.cos(t) * sin_phi + ry * math.sin(t) * cos_phi,
+            )
+        )
+    return out
+
+
+def _parse_path(d: str) -> Iterator[tuple[list[tuple[float, float]], bool]]:
+    """Yields (points, is_closed) for each subpath of an SVG path."""
+    tokens = _PATH_TOKEN_RE.findall(d)
+    i = 0
+    cmd = ""
+    cur = (0.0, 0.0)
+    start = cur
+    last_ctrl = None
+    sub: list[tuple[float, float]] = []
+
+    def nums(k: int) -> list[float]:
+        nonlocal i
+        vals = [float(t) for t in tokens[i : i + k]]
+        if len(vals) < k or any(t.isalpha() for t in tokens[i : i + k]):
+            raise ValueError("Truncated path data")
+        i += k
+        return vals
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            cmd = tokens[i]
+            i += 1
+        elif not cmd:
+            return
+        rel = cmd.islower()
+        c = cmd.upper()
+        ox, oy = cur if rel else (0.0, 0.0)
+        if c == "Z":
+            if len(sub) > 1:
+                yield sub, True
+            sub = []
+            cur = start
+            last_ctrl = None
+            cmd = ""
+            continue
+        try:
+            if c == "M":
+                x, y = nums(2)
+                if len(sub) > 1:
+                    yield sub, False
+                cur = start = (ox + x, oy + y)
+                sub = [cur]
+                cmd = "l" if rel else "L"
+                last_ctrl = None
+                continue
+            if c == "L":
+                x, y = nums(2)
+                new = [(ox + x, oy + y)]
+            elif c == "H":
+                (x,) = nums(1)
+                new = [(ox + x, cur[1])]
+            elif c == "V":
+                (y,) = nums(1)
+                new = [(cur[0], oy + y)]
+            elif c in ("C", "S"):
+                if c == "C":
+                    x1, y1, x2, y2, x, y = nums(6)
+                    c1 = (ox + x1, oy + y1)
+                else:
+                    x2, y2, x, y = nums(4)
+                    c1 = (
+                        (2 * cur[0] - last_ctrl[0], 2 * cur[1] - last_ctrl[1])
+                        if last_ctrl
+                        else cur
+                    )
+                c2 = (ox + x2, oy + y2)
+                new = _cubic(cur, c1, c2, (ox + x, oy + y))
+                last_ctrl = c2
+            elif c in ("Q", "T"):
+                if c == "Q":
+                    x1, y1, x, y = nums(4)
+                    c1 = (ox + x1, oy + y1)
+                else:
+                    x, y = nums(2)
+                    c1 = (
+                        (2 * cur[0] - last_ctrl[0], 2 * cur[1] - last_ctrl[1])
+                        if last_ctrl
+                        else cur
+                    )
+                new = _quadratic(cur, c1, (ox + x, oy + y))
+                last_ctrl = c1
+            elif c == "A":
+                arx, ary, phi, large, sweep, x, y = nums(7)
+                new = _arc(cur, arx, ary, phi, bool(large), bool(sweep), (ox + x, oy + y))
+            else:
+                return
+        except ValueError:
+            break
+        if c not in ("C", "S", "Q", "T"):
+            last_ctrl = None
+        if not sub:
+            sub = [cur]
+        sub.extend(new)
+        cur = new[-1]
+    if len(sub) > 1:
+        yield sub, False
+
+
+class SVGReader(PlanReader):
+    """Reads line, polyline, polygon, rect, circle, ellipse and path elements
+    from an SVG stream, applying nested ``transform`` attributes."""
+
+    _viewport: tuple[float, float] | None = None
+
+    def _detect_units(self, root: ET.Element) -> float:
+        """Returns the size of one SVG user unit in ``self.units``.
+
+        A percentage width is relative to a viewport the file does not define,
+        so it gives no physical size and the drawing is read in user units.
+        Without a viewBox a user unit is one CSS pixel whatever the width's
+        unit, so the width is ignored then too.
+        """
+        width = _LENGTH_RE.match(root.get("width", "") or "")
+        view_box = [
+            float(n) for n in re.findall(_NUMBER_RE, root.get("viewBox", "") or "")
+        ]
+        if len(view_box) == 4 and view_box[2] > 0 and view_box[3] > 0:
+            self._viewport = (view_box[2], view_box[3])
+        if width and (width.group(2) == "%" or self._viewport is None):
+            width = None
+        unit = width.group(2) if width else ""
+        if not self.forced_units:
+            self.units = unit if unit in FEET_PER_UNIT else "px"
+        if width and self._viewport is not None:
+            return float(width.group(1)) / self._viewport[0]
+        return 1.0
+
+    def _length(self, value: str | None, axis: str) -> float | None:
+        """Parses a length attribute in user units. Percentages resolve
+        against the viewBox width (``x``), height (``y``) or normalised
+        diagonal (``xy``); without a viewBox they cannot be resolved and
+        None is returned."""
+        match = _LENGTH_RE.match(value or "0")
+        if not match:
+            return 0.0
+        number = float(match.group(1))
+        if match.group(2) != "%":
+            return number
+        if self._viewport is None:
+            return None
+        w, h = self._viewport
+        ref = {"x": w, "y": h}.get(axis, math.hypot(w, h) / math.sqrt(2))
+        return number / 100 * ref
+
+    def __iter__(self) -> Iterator[Shape]:
+        stack: list[tuple[ET.Element, Matrix]] = []
+        skip_depth = 0
+        root = None
+        for event, elem in ET.iterparse(self.source, events=("start", "end")):
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if root is None:
+                    root = elem
+                    user_unit = self._detect_units(elem)
+                    base: Matrix = (user_unit, 0.0, 0.0, user_unit, 0.0, 0.0)
+                    stack.append((elem, _multiply(base, _parse_transform(elem.get("transform")))))
+                    continue
+                if skip_depth or tag in _SKIPPED_CONTAINERS:
+                    skip_depth += 1
+                parent_matrix = stack[-1][1]
+                stack.append(
+                    (elem, _multiply(parent_matrix, _parse_transform(elem.get("transform"))))
+                )
+                continue
+            _, matrix = stack.pop()
+            if skip_depth:
+                skip_depth -= 1
+            elif elem is not root:
+                for points, closed in self._element_points(tag, elem):
+                    self.entities_read += 1
+                    shape = self._factory.make(
+                        [self._apply(matrix, p) for p in points], closed
+                    )
+                    if shape is None:
+                        self.entities_skipped += 1
+                    else:
+                        yield shape
+            elem.clear()
+            if stack:
+                stack[-1][0].remove(elem)
+
+    def _apply(self, m: Matrix, p: tuple[float, float]) -> Point:
+        s = self.scale
+        return {
+            "x": (m[0] * p[0] + m[2] * p[1] + m[4]) * s,
+            "y": (m[1] * p[0] + m[3] * p[1] + m[5]) * s,
+        }
+
+    def _element_points(
+        self, tag: str, elem: ET.Element
+    ) -> Iterator[tuple[list[tuple[float, float]], bool]]:
+        lengths = {}
+        if tag in _BASIC_SHAPES:
+            lengths = {
+                name: self._length(elem.get(name), axis)
+                for name, axis in _LENGTH_AXES.items()
+                if name in elem.attrib
+            }
+            if None in lengths.values():
+                # Unresolvable percentage: yield nothing drawable so the
+                # element is counted as skipped.
+                yield [], False
+                return
+
+        def num(name: str) -> float:
+            return lengths.get(name, 0.0)
+
+        if tag == "line":
+            yield [(num("x1"), num("y1")), (num("x2"), num("y2"))], False
+        elif tag in ("polyline", "polygon"):
+            v = [float(n) for n in re.findall(_NUMBER_RE, elem.get("points", ""))]
+            yield list(zip(v[0::2], v[1::2])), tag == "polygon"
+        elif tag == "rect":
+            x, y, w, h = num("x"), num("y"), num("width"), num("height")
+            if w > 0 and h > 0:
+                yield [(x, y), (x + w, y), (x + w, y + h), (x, y + h)], True
+        elif tag in ("circle", "ellipse"):
+            cx, cy = num("cx"), num("cy")
+            rx = num("r") if tag == "circle" else num("rx")
+            ry = num("r") if tag == "circle" else num("ry")
+            if rx > 0 and ry > 0:
+                ring = arc_points(0.0, 0.0, 1.0, 0.0, 360.0)[:-1]
+                yield [(cx + rx * p["x"], cy + ry * p["y"]) for p in ring], True
+        elif tag == "path":
+            yield from _parse_path(elem.get("d", ""))
+
+
+def open_reader(source: IO, fmt: str, **kwargs) -> PlanReader:
+    if fmt == "dxf":
+        return DXFReader(source, **kwargs)
+    if fmt == "svg":
+        return SVGReader(source, **kwargs)
+    raise ValueError(f"Unsupported plan format: {fmt!r}")
+
+
+def import_plan(
+    source: IO, fmt: str, normalize_origin: bool = True, **kwargs
+) -> tuple[list[Shape], PlanReader]:
+    """Parses a whole plan into a shape list ready for a single state update.
+
+    With ``normalize_origin`` the imported geometry is shifted so its bounding
+    box starts at the world origin, which lines it up with the plot boundary.
+    """
+    reader = open_reader(source, fmt, **kwargs)
+    shapes = list(reader)
+    if normalize_origin and shapes:
+        min_x = min(bounds(s["points"])[0] for s in shapes)
+        min_y = min(bounds(s["points"])[1] for s in shapes)
+        for shape in shapes:
+            shape["points"] = [
+                quantize_point({"x": p["x"] - min_x, "y": p["y"] - min_y})
+                for p in shape["points"]
+            ]
+    return shapes, reader
@@ -0,0 +1,46 @@
+"""Progressive low-DPI previews of the export sheet.
+
+The export panel shows the A2 sheet rendered with the same PNG renderer as
+a real export, first at a coarse DPI that renders in a few milliseconds and
+then at successively finer ones. All levels share one small ``ExportCache``,
+keyed by the drawing's content hash and the level's DPI, so an unchanged
+drawing previews straight from disk at the finest level.
+"""
+
+import os
+from pathlib import Path
+from app.core.export import render_project
+from app.core.export_cache import ExportCache, cache_key, get_export_cache
+from app.core.models import Project
+
+PREVIEW_DPIS = (12, 24, 48)
+PREVIEW_CACHE_BYTES = (
+    int(os.environ.get("FLOORPLAN_PREVIEW_CACHE_MB", "32")) * 1024 * 1024
+)
+
+
+def get_preview_cache(directory: str | Path) -> ExportCache:
+    """Returns the process-wide thumbnail cache for ``directory``."""
+    return get_export_cache(directory, PREVIEW_CACHE_BYTES)
+
+
+def preview_keys(project: Project) -> dict[int, str]:
+    """Returns the cache key of each preview level."""
+    return {dpi: cache_key(project, "png", dpi) for dpi in PREVIEW_DPIS}
+
+
+def cached_preview(keys: dict[int, str], cache: ExportCache) -> int | None:
+    """Returns the DPI of the finest cached preview, if any. Probing does not
+    count towards the cache's hit/miss stats."""
+    for dpi in reversed(PREVIEW_DPIS):
+        if cache.contains(keys[dpi], "png"):
+            return dpi
+    return None
+
+
+def render_preview(project: Project, dpi: int, key: str, cache: ExportCache) -> str:
+    """Renders (or reuses) the preview at ``dpi`` stored under ``key``;
+    returns its relative path."""
+    if cache.get(key, "png") is None:
+        cache.put(key, "png", lambda out: render_project(project, "png", dpi, out))
+    return cache.relpath(key, "png")
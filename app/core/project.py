@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+from app.core.models import Layer, Project, Shape, SymbolInstance
+from app.core.symbols import expand_instance
+
+PROJECT_VERSION = 1
+PROJECT_SUFFIX = ".json"
+
+
+def make_project(
+    shapes: list[Shape],
+    plot_width_ft: str,
+    plot_height_ft: str,
+    layers: list[Layer] | None = None,
+    symbols: list[SymbolInstance] | None = None,
+) -> Project:
+    return {
+        "version": PROJECT_VERSION,
+        "plot_width_ft": plot_width_ft,
+        "plot_height_ft": plot_height_ft,
+        "shapes": shapes,
+        "layers": layers or [],
+        "symbols": symbols or [],
+    }
+
+
+def dumps_project(project: Project) -> str:
+    return json.dumps(project, separators=(",", ":"))
+
+
+def parse_project(data: dict) -> Project:
+    """Validates a decoded project document and fills in defaults."""
+    version = data.get("version", 1)
+    if not isinstance(version, int) or version > PROJECT_VERSION:
+        raise ValueError(f"Unsupported project version: {version!r}")
+    shapes = data.get("shapes")
+    if not isinstance(shapes, list):
+        raise ValueError("Project has no shape list.")
+    return {
+        "version": PROJECT_VERSION,
+        "plot_width_ft": str(data.get("plot_width_ft", "50")),
+        "plot_height_ft": str(data.get("plot_height_ft", "90")),
+        "shapes": shapes,
+        "layers": data.get("layers") or [],
+        "symbols": data.get("symbols") or [],
+    }
+
+
+def load_project(path: str | Path) -> Project:
+    with open(path, encoding="utf-8") as f:
+        return parse_project(json.load(f))
+
+
+def plot_dimensions(project: Project) -> tuple[float, float]:
+    """Returns the plot size in feet, falling back to the plot boundary shape
+    when the stored dimension strings are not numbers."""
+    try:
+        return float(project["plot_width_ft"]), float(project["plot_height_ft"])
+    except ValueError:
+        for shape in project["shapes"]:
+            if shape["id"] == "plot_boundary":
+                xs = [p["x"] for p in shape["points"]]
+                ys = [p["y"] for p in shape["points"]]
+                return max(xs) - min(xs), max(ys) - min(ys)
+    return 1.0, 1.0
+
+
+def visible_shapes(project: Project) -> list[Shape]:
+    """Returns the shapes to export: those not on a hidden layer, followed by
+    the expanded geometry of visible symbol placements."""
+    hidden = {layer["name"] for layer in project["layers"] if not layer["visible"]}
+    shapes = [shape for shape in project["shapes"] if shape["layer"] not in hidden]
+    for instance in project["symbols"]:
+        if instance["layer"] not in hidden:
+            shapes.extend(expand_instance(instance))
+    return shapes
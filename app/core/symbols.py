@@ -0,0 +1,139 @@
+"""Door, window and fixture symbols stored once and placed by transform.
+
+Each symbol's geometry lives in ``SYMBOL_LIBRARY`` in local feet, with the
+origin at the insertion point and +x along the host wall. A placement is a
+``SymbolInstance`` holding only a position, rotation and scale, so state size
+grows with the number of placements rather than their vertices. The canvas
+renders instances through SVG ``<use>``; geometry is expanded into plain
+shapes only for export.
+"""
+
+import math
+from typing import TypedDict
+from app.core.geometry import arc_points, format_path, polygon_area, quantize_point
+from app.core.models import Point, Shape, SymbolInstance
+
+SYMBOL_STROKE_MM = 0.25
+SYMBOL_STROKE_COLOR = "#1a1a1a"
+
+
+class SymbolPath(TypedDict):
+    points: list[Point]
+    is_closed: bool
+
+
+class SymbolDef(TypedDict):
+    id: str
+    name: str
+    icon: str
+    paths: list[SymbolPath]
+
+
+def _rect(x: float, y: float, w: float, h: float) -> SymbolPath:
+    return {
+        "points": [
+            {"x": x, "y": y},
+            {"x": x + w, "y": y},
+            {"x": x + w, "y": y + h},
+            {"x": x, "y": y + h},
+        ],
+        "is_closed": True,
+    }
+
+
+def _ellipse(cx: float, cy: float, rx: float, ry: float) -> SymbolPath:
+    ring = arc_points(0.0, 0.0, 1.0, 0.0, 360.0, segments_per_circle=24)[:-1]
+    return {
+        "points": [{"x": cx + rx * p["x"], "y": cy + ry * p["y"]} for p in ring],
+        "is_closed": True,
+    }
+
+
+def _line(*points: tuple[float, float]) -> SymbolPath:
+    return {"points": [{"x": x, "y": y} for x, y in points], "is_closed": False}
+
+
+SYMBOL_LIBRARY: list[SymbolDef] = [
+    {
+        "id": "door",
+        "name": "Door (3 ft)",
+        "icon": "door-open",
+        "paths": [
+            _line((0, 0), (0, -3)),
+            {
+                "points": arc_points(0.0, 0.0, 3.0, 270.0, 360.0, 32),
+                "is_closed": False,
+            },
+        ],
+    },
+    {
+        "id": "window",
+        "name": "Window (4 ft)",
+        "icon": "app-window",
+        "paths": [_rect(0, -0.25, 4, 0.5), _line((0, 0), (4, 0))],
+    },
+    {
+        "id": "sink",
+        "name": "Sink",
+        "icon": "droplet",
+        "paths": [_rect(0, 0, 2, 1.5), _ellipse(1, 0.8, 0.7, 0.5)],
+    },
+    {
+        "id": "toilet",
+        "name": "Toilet",
+        "icon": "toilet",
+        "paths": [_rect(0, 0, 1.75, 0.6), _ellipse(0.875, 1.45, 0.65, 0.85)],
+    },
+]
+SYMBOLS_BY_ID: dict[str, SymbolDef] = {s["id"]: s for s in SYMBOL_LIBRARY}
+
+
+def symbol_path_data(symbol: SymbolDef) -> list[str]:
+    """Returns one SVG path ``d`` string per symbol path."""
+    return [
+        format_path(path["points"], relative=False) + ("Z" if path["is_closed"] else "")
+        for path in symbol["paths"]
+    ]
+
+
+def _transform_point(p: Point, instance: SymbolInstance) -> Point:
+    theta = math.radians(instance["rotation_deg"])
+    x = p["x"] * instance["scale_x"]
+    y = p["y"] * instance["scale_y"]
+    return quantize_point(
+        {
+            "x": instance["x"] + x * math.cos(theta) - y * math.sin(theta),
+            "y": instance["y"] + x * math.sin(theta) + y * math.cos(theta),
+        }
+    )
+
+
+def expand_instance(instance: SymbolInstance) -> list[Shape]:
+    """Expands a placement into plain shapes in world coordinates."""
+    symbol = SYMBOLS_BY_ID.get(instance["symbol_id"])
+    if symbol is None:
+        return []
+    shapes = []
+    for index, path in enumerate(symbol["paths"]):
+        points = [_transform_point(p, instance) for p in path["points"]]
+        if path["is_closed"]:
+            shape_type = "polygon"
+        elif len(points) == 2:
+            shape_type = "line"
+        else:
+            shape_type = "freehand"
+        shapes.append(
+            {
+                "id": f"{instance['id']}:{index}",
+                "type": shape_type,
+                "points": points,
+                "stroke_mm": SYMBOL_STROKE_MM,
+                "stroke_color": SYMBOL_STROKE_COLOR,
+                "fill_color": "transparent",
+                "layer": instance["layer"],
+                "label_visibility": False,
+                "is_closed": path["is_closed"],
+                "area": polygon_area(points) if path["is_closed"] else 0.0,
+            }
+        )
+    return shapes
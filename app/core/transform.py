@@ -0,0 +1,203 @@
+"""Affine transforms for the 9-handle selection box.
+
+Every handle drag reduces to one 3x3 affine matrix: the 4 corners scale
+(uniformly with the aspect ratio locked), the 4 edge midpoints scale along
+one axis or, with Shift, shear along their edge, the centre translates and
+the rotation handle rotates about the box centre; Alt anchors scaling at the
+centre instead of the opposite side.
+
+While dragging only the matrix changes, and the canvas applies it to the
+selection as an SVG ``matrix(...)`` transform. ``VertexBatch`` packs the
+selection's vertices into one numpy array so the final matrix is applied to
+all of them in a single operation on release.
+
+numpy is imported on first use so it does not add to app startup.
+"""
+
+import math
+from typing import TYPE_CHECKING
+from app.core.geometry import precision_digits
+from app.core.models import CanvasConfig, Point, Shape
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CORNER_HANDLES = ("nw", "ne", "se", "sw")
+EDGE_HANDLES = ("n", "e", "s", "w")
+HANDLES = CORNER_HANDLES + EDGE_HANDLES + ("center", "rotate")
+HANDLE_CURSORS = {
+    "nw": "nwse-resize",
+    "se": "nwse-resize",
+    "ne": "nesw-resize",
+    "sw": "nesw-resize",
+    "n": "ns-resize",
+    "s": "ns-resize",
+    "e": "ew-resize",
+    "w": "ew-resize",
+    "center": "move",
+    "rotate": "alias",
+}
+
+Box = tuple[float, float, float, float]
+
+
+def translation(dx: float, dy: float) -> "np.ndarray":
+    import numpy as np
+
+    return np.array([[1.0, 0.0, dx], [0.0, 1.0, dy], [0.0, 0.0, 1.0]])
+
+
+def scaling(sx: float, sy: float, ox: float = 0.0, oy: float = 0.0) -> "np.ndarray":
+    import numpy as np
+
+    m = np.array([[sx, 0.0, 0.0], [0.0, sy, 0.0], [0.0, 0.0, 1.0]])
+    return translation(ox, oy) @ m @ translation(-ox, -oy)
+
+
+def shearing(kx: float, ky: float, ox: float = 0.0, oy: float = 0.0) -> "np.ndarray":
+    import numpy as np
+
+    m = np.array([[1.0, kx, 0.0], [ky, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    return translation(ox, oy) @ m @ translation(-ox, -oy)
+
+
+def rotation(degrees: float, ox: float = 0.0, oy: float = 0.0) -> "np.ndarray":
+    import numpy as np
+
+    c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+    m = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    return translation(ox, oy) @ m @ translation(-ox, -oy)
+
+
+def svg_matrix(m: "np.ndarray") -> str:
+    """Returns ``m`` as an SVG ``transform`` attribute value."""
+    a, c, e = m[0]
+    b, d, f = m[1]
+    return f"matrix({a:.6g} {b:.6g} {c:.6g} {d:.6g} {e:.6g} {f:.6g})"
+
+
+def handle_positions(box: Box, handle_size: float) -> dict[str, Point]:
+    """Returns the world position of each handle for a selection box."""
+    x0, y0, x1, y1 = box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return {
+        "nw": {"x": x0, "y": y0},
+        "n": {"x": cx, "y": y0},
+        "ne": {"x": x1, "y": y0},
+        "e": {"x": x1, "y": cy},
+        "se": {"x": x1, "y": y1},
+        "s": {"x": cx, "y": y1},
+        "sw": {"x": x0, "y": y1},
+        "w": {"x": x0, "y": cy},
+        "center": {"x": cx, "y": cy},
+        "rotate": {"x": cx, "y": y0 - 3 * handle_size},
+    }
+
+
+def handle_at(box: Box, p: Point, handle_size: float) -> str | None:
+    """Returns the handle under ``p``, if any."""
+    for name, h in handle_positions(box, handle_size).items():
+        if abs(p["x"] - h["x"]) <= handle_size and abs(p["y"] - h["y"]) <= handle_size:
+            return name
+    return None
+
+
+def _factor(moved: float, edge: float, anchor: float) -> float:
+    extent = edge - anchor
+    if abs(extent) < CanvasConfig.COORD_PRECISION_FT:
+        return 1.0
+    return (edge + moved - anchor) / extent
+
+
+def handle_matrix(
+    handle: str,
+    box: Box,
+    start: Point,
+    current: Point,
+    lock_aspect: bool = False,
+    symmetric: bool = False,
+    shear: bool = False,
+) -> "np.ndarray":
+    """Returns the affine matrix for dragging ``handle`` from start to current."""
+    x0, y0, x1, y1 = box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    dx, dy = current["x"] - start["x"], current["y"] - start["y"]
+    if handle == "center":
+        return translation(dx, dy)
+    if handle == "rotate":
+        degrees = math.degrees(
+            math.atan2(current["y"] - cy, current["x"] - cx)
+            - math.atan2(start["y"] - cy, start["x"] - cx)
+        )
+        return rotation(degrees, cx, cy)
+    # Edge being dragged and the fixed anchor opposite it, per axis.
+    edge_x, anchor_x = (x0, x1) if "w" in handle else (x1, x0)
+    edge_y, anchor_y = (y0, y1) if "n" in handle else (y1, y0)
+    if symmetric:
+        anchor_x, anchor_y = cx, cy
+    if handle in EDGE_HANDLES:
+        if handle in ("e", "w"):
+            if shear:
+                extent = edge_x - anchor_x
+                ky = dy / extent if abs(extent) > 0 else 0.0
+                return shearing(0.0, ky, anchor_x, cy)
+            return scaling(_factor(dx, edge_x, anchor_x), 1.0, anchor_x, cy)
+        if shear:
+            extent = edge_y - anchor_y
+            kx = dx / extent if abs(extent) > 0 else 0.0
+            return shearing(kx, 0.0, cx, anchor_y)
+        return scaling(1.0, _factor(dy, edge_y, anchor_y), cx, anchor_y)
+    sx = _factor(dx, edge_x, anchor_x)
+    sy = _factor(dy, edge_y, anchor_y)
+    if lock_aspect:
+        s = max(abs(sx), abs(sy))
+        sx = math.copysign(s, sx)
+        sy = math.copysign(s, sy)
+    return scaling(sx, sy, anchor_x, anchor_y)
+
+
+class VertexBatch:
+    """The vertices of a set of shapes packed into one (N, 2) array."""
+
+    def __init__(self, shapes: list[Shape]):
+        import numpy as np
+
+        self.shapes = shapes
+        counts = [len(s["points"]) for s in shapes]
+        self.offsets = np.cumsum([0] + counts)
+        self.xy = np.array(
+            [(p["x"], p["y"]) for s in shapes for p in s["points"]], dtype=np.float64
+        ).reshape(-1, 2)
+        self._bounds: Box | None = None
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    def bounds(self) -> Box:
+        if self._bounds is None:
+            if not len(self.xy):
+                return (0.0, 0.0, 0.0, 0.0)
+            (x0, y0), (x1, y1) = self.xy.min(axis=0), self.xy.max(axis=0)
+            self._bounds = (float(x0), float(y0), float(x1), float(y1))
+        return self._bounds
+
+    def apply(self, m: "np.ndarray | list[list[float]]") -> list[Shape]:
+        """Returns copies of the shapes with ``m`` applied to every vertex,
+        snapped to the coordinate grid."""
+        import numpy as np
+
+        m = np.asarray(m)
+        step = CanvasConfig.COORD_PRECISION_FT
+        xy = self.xy @ m[:2, :2].T + m[:2, 2]
+        xy = (np.round(xy / step) * step).round(precision_digits(step)).tolist()
+        area_scale = abs(float(np.linalg.det(m[:2, :2])))
+        out = []
+        for shape, start, end in zip(self.shapes, self.offsets, self.offsets[1:]):
+            out.append(
+                {
+                    **shape,
+                    "points": [{"x": x, "y": y} for x, y in xy[start:end]],
+                    "area": shape["area"] * area_scale,
+                }
+            )
+        return out
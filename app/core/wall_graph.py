@@ -0,0 +1,424 @@
+"""Planar graph of walls with automatic room detection.
+
+Walls are two-point segments (shapes drawn with the line tool). The graph
+splits them at every crossing and T-junction and traces the faces of the
+resulting planar subdivision; bounded faces are rooms.
+
+Vertices are keyed on the ``CanvasConfig.COORD_PRECISION_FT`` grid, so
+endpoints that meet on the grid are the same vertex. The initial build finds
+all crossings with a sweep over x; afterwards ``add_wall``/``remove_wall``/
+``move_wall`` only re-split the walls they touch (found through a uniform
+grid index) and only retrace the faces around vertices whose edges changed.
+"""
+
+import heapq
+import math
+from app.core.geometry import point_in_polygon
+from app.core.models import CanvasConfig, Point, Room, Shape
+
+MIN_ROOM_AREA_SQFT = 1.0
+INDEX_CELL_FT = 4.0
+
+VertexKey = tuple[int, int]
+HalfEdge = tuple[VertexKey, VertexKey]
+Segment = tuple[str, Point, Point]
+
+
+def _key(x: float, y: float) -> VertexKey:
+    step = CanvasConfig.COORD_PRECISION_FT
+    return (round(x / step), round(y / step))
+
+
+def _cross(ax: float, ay: float, bx: float, by: float) -> float:
+    return ax * by - ay * bx
+
+
+def segment_intersections(a: Point, b: Point, c: Point, d: Point) -> list[Point]:
+    """Returns the points shared by segments ab and cd (endpoints included).
+
+    Crossing segments share one point; collinear overlapping segments share
+    the endpoints of each that lie on the other.
+    """
+    if (c["x"], c["y"], d["x"], d["y"]) < (a["x"], a["y"], b["x"], b["y"]):
+        # Same pair, same rounding, whichever order the walls come in.
+        return segment_intersections(c, d, a, b)
+    rx, ry = b["x"] - a["x"], b["y"] - a["y"]
+    sx, sy = d["x"] - c["x"], d["y"] - c["y"]
+    qpx, qpy = c["x"] - a["x"], c["y"] - a["y"]
+    denom = _cross(rx, ry, sx, sy)
+    eps = CanvasConfig.COORD_PRECISION_FT
+    if abs(denom) > 1e-12:
+        t = _cross(qpx, qpy, sx, sy) / denom
+        u = _cross(qpx, qpy, rx, ry) / denom
+        len_r = math.hypot(rx, ry) or 1.0
+        len_s = math.hypot(sx, sy) or 1.0
+        if (
+            -eps / len_r <= t <= 1 + eps / len_r
+            and -eps / len_s <= u <= 1 + eps / len_s
+        ):
+            return [{"x": a["x"] + t * rx, "y": a["y"] + t * ry}]
+        return []
+    # Test collinearity against the longer segment: any point passes the
+    # test against a zero-length one.
+    len_r, len_s = math.hypot(rx, ry), math.hypot(sx, sy)
+    if len_r >= len_s:
+        off_line = abs(_cross(qpx, qpy, rx, ry)) > eps * len_r
+    else:
+        off_line = abs(_cross(qpx, qpy, sx, sy)) > eps * len_s
+    if off_line:
+        return []
+    shared = []
+    for p, (s, e) in ((c, (a, b)), (d, (a, b)), (a, (c, d)), (b, (c, d))):
+        if (
+            min(s["x"], e["x"]) - eps <= p["x"] <= max(s["x"], e["x"]) + eps
+            and min(s["y"], e["y"]) - eps <= p["y"] <= max(s["y"], e["y"]) + eps
+        ):
+            shared.append(p)
+    return shared
+
+
+def sweep_intersections(
+    segments: list[tuple[Point, Point]],
+) -> list[tuple[int, int, list[Point]]]:
+    """Finds every intersecting pair among ``segments`` with a sweep over x.
+
+    Segments enter the sweep at their left end and leave after their right
+    end; each entering segment is tested only against active segments whose
+    y-extent overlaps its own. Returns ``(i, j, points)`` per intersecting pair.
+    """
+    eps = CanvasConfig.COORD_PRECISION_FT
+    order = sorted(
+        range(len(segments)),
+        key=lambda i: min(segments[i][0]["x"], segments[i][1]["x"]),
+    )
+    active: dict[int, tuple[float, float]] = {}
+    leaving: list[tuple[float, int]] = []
+    found = []
+    for i in order:
+        a, b = segments[i]
+        min_x = min(a["x"], b["x"])
+        while leaving and leaving[0][0] < min_x - eps:
+            active.pop(heapq.heappop(leaving)[1], None)
+        min_y, max_y = min(a["y"], b["y"]), max(a["y"], b["y"])
+        for j, (other_min_y, other_max_y) in active.items():
+            if other_max_y < min_y - eps or other_min_y > max_y + eps:
+                continue
+            points = segment_intersections(a, b, *segments[j])
+            if points:
+                found.append((j, i, points))
+        active[i] = (min_y, max_y)
+        heapq.heappush(leaving, (max(a["x"], b["x"]), i))
+    return found
+
+
+def wall_segments(shapes: list[Shape]) -> list[Segment]:
+    """Returns ``(id, start, end)`` for every line shape."""
+    return [
+        (s["id"], s["points"][0], s["points"][-1])
+        for s in shapes
+        if s["type"] == "line" and len(s["points"]) >= 2
+    ]
+
+
+class WallGraph:
+    """Walls split at junctions, with faces traced over the half-edges."""
+
+    def __init__(self):
+        self._walls: dict[str, tuple[Point, Point]] = {}
+        # Vertices along each wall, ordered from its start to its end.
+        self._wall_vertices: dict[str, list[VertexKey]] = {}
+        self._vertex_walls: dict[VertexKey, set[str]] = {}
+        self._edge_count: dict[tuple[VertexKey, VertexKey], int] = {}
+        self._adjacency: dict[VertexKey, set[VertexKey]] = {}
+        self._rotation: dict[VertexKey, list[VertexKey]] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._faces: dict[int, list[VertexKey]] = {}
+        self._face_of: dict[HalfEdge, int] = {}
+        self._next_face = 0
+        self._dirty: set[HalfEdge] = set()
+
+    @classmethod
+    def from_segments(cls, segments: list[Segment]) -> "WallGraph":
+        """Builds the graph in one pass using the sweep-line search."""
+        graph = cls()
+        hits: dict[int, list[Point]] = {}
+        for i, j, points in sweep_intersections([(a, b) for _, a, b in segments]):
+            hits.setdefault(i, []).extend(points)
+            hits.setdefault(j, []).extend(points)
+        for index, (wall_id, a, b) in enumerate(segments):
+            graph._walls[wall_id] = (a, b)
+            graph._index(wall_id, a, b)
+            graph._set_wall_vertices(wall_id, graph._ordered(a, b, hits.get(index, [])))
+        graph._retrace()
+        return graph
+
+    def __len__(self) -> int:
+        return len(self._walls)
+
+    def add_wall(self, wall_id: str, a: Point, b: Point) -> None:
+        if wall_id in self._walls:
+            self.remove_wall(wall_id)
+        hits = []
+        for other in self._candidates(a, b):
+            c, d = self._walls[other]
+            points = segment_intersections(a, b, c, d)
+            if points:
+                hits.extend(points)
+                keys = set(self._wall_vertices[other])
+                keys.update(_key(p["x"], p["y"]) for p in points)
+                self._set_wall_vertices(other, self._sort_along(c, d, keys))
+        self._walls[wall_id] = (a, b)
+        self._index(wall_id, a, b)
+        self._set_wall_vertices(wall_id, self._ordered(a, b, hits))
+        self._retrace()
+
+    def remove_wall(self, wall_id: str) -> None:
+        if wall_id not in self._walls:
+            return
+        vertices = self._wall_vertices[wall_id]
+        self._set_wall_vertices(wall_id, [])
+        del self._wall_vertices[wall_id]
+        a, b = self._walls.pop(wall_id)
+        for cell in self._cells_for(a, b):
+            self._cells[cell].discard(wall_id)
+        # Junctions this wall made on other walls are merged back unless
+        # some other wall still meets them there.
+        for v in vertices:
+            for other in list(self._vertex_walls.get(v, ())):
+                if not self._meets_at(other, v):
+                    other_vertices = self._wall_vertices[other]
+                    self._set_wall_vertices(
+                        other, [k for k in other_vertices if k != v]
+                    )
+        self._retrace()
+
+    def move_wall(self, wall_id: str, a: Point, b: Point) -> None:
+        self.remove_wall(wall_id)
+        self.add_wall(wall_id, a, b)
+
+    def rooms(self) -> list[Room]:
+        """Returns bounded faces of at least ``MIN_ROOM_AREA_SQFT``.
+
+        A closed loop of walls standing free inside a room (a shaft, a
+        column) is a room of its own, and its footprint is subtracted from
+        the area and centroid of the innermost room around it.
+        """
+        step = CanvasConfig.COORD_PRECISION_FT
+        # face id -> [gross area, net area, net x moment, net y moment]
+        bounded: dict[int, list[float]] = {}
+        holes = []
+        for face_id, cycle in self._faces.items():
+            area, cx, cy = self._signed_area_centroid(cycle)
+            if area > 0:
+                bounded[face_id] = [area, area, cx * area, cy * area]
+            elif area < 0:
+                # The outline of a connected group of walls, traced clockwise.
+                holes.append((cycle[0], -area, cx, cy))
+        for vertex, area, cx, cy in holes:
+            host = self._enclosing_face(vertex, bounded)
+            if host is not None:
+                totals = bounded[host]
+                totals[1] -= area
+                totals[2] -= cx * area
+                totals[3] -= cy * area
+        rooms = []
+        for face_id, (_, area, mx, my) in bounded.items():
+            if area < MIN_ROOM_AREA_SQFT:
+                continue
+            rooms.append(
+                {
+                    "id": f"room_{face_id}",
+                    "points": [
+                        {"x": k[0] * step, "y": k[1] * step}
+                        for k in self._faces[face_id]
+                    ],
+                    "area": round(area, 2),
+                    "centroid": {
+                        "x": round(mx / area * step, 3),
+                        "y": round(my / area * step, 3),
+                    },
+                }
+            )
+        return rooms
+
+    def _enclosing_face(
+        self, vertex: VertexKey, bounded: dict[int, list[float]]
+    ) -> int | None:
+        """Returns the smallest bounded face strictly containing ``vertex``.
+
+        Walls that met a face's edges would have been split into it, so a
+        vertex not on a face's boundary is either inside it or outside.
+        """
+        step = CanvasConfig.COORD_PRECISION_FT
+        p = {"x": vertex[0] * step, "y": vertex[1] * step}
+        best, best_area = None, math.inf
+        for face_id, (gross, *_) in bounded.items():
+            cycle = self._faces[face_id]
+            if gross >= best_area or vertex in cycle:
+                continue
+            points = [{"x": k[0] * step, "y": k[1] * step} for k in cycle]
+            if point_in_polygon(p, points):
+                best, best_area = face_id, gross
+        return best
+
+    def _meets_at(self, wall_id: str, v: VertexKey) -> bool:
+        """Whether a full rebuild would split ``wall_id`` at ``v``: the wall
+        ends there, or another wall through ``v`` intersects it there."""
+        a, b = self._walls[wall_id]
+        if v in (_key(a["x"], a["y"]), _key(b["x"], b["y"])):
+            return True
+        for other in self._vertex_walls[v]:
+            if other == wall_id:
+                continue
+            points = segment_intersections(a, b, *self._walls[other])
+            if any(_key(p["x"], p["y"]) == v for p in points):
+                return True
+        return False
+
+    def _ordered(self, a: Point, b: Point, points: list[Point]) -> list[VertexKey]:
+        keys = {_key(a["x"], a["y"]), _key(b["x"], b["y"])}
+        keys.update(_key(p["x"], p["y"]) for p in points)
+        return self._sort_along(a, b, keys)
+
+    @staticmethod
+    def _sort_along(a: Point, b: Point, keys: set[VertexKey]) -> list[VertexKey]:
+        step = CanvasConfig.COORD_PRECISION_FT
+        dx, dy = b["x"] - a["x"], b["y"] - a["y"]
+        return sorted(
+            keys,
+            key=lambda k: (k[0] * step - a["x"]) * dx + (k[1] * step - a["y"]) * dy,
+        )
+
+    def _set_wall_vertices(self, wall_id: str, vertices: list[VertexKey]) -> None:
+        """Replaces a wall's split points, updating edge counts and marking
+        the faces around any vertex whose edges change for retracing."""
+        old = self._wall_vertices.get(wall_id, [])
+        for v in old:
+            walls = self._vertex_walls[v]
+            walls.discard(wall_id)
+            if not walls:
+                del self._vertex_walls[v]
+        for v in vertices:
+            self._vertex_walls.setdefault(v, set()).add(wall_id)
+        old_edges = {(min(u, v), max(u, v)) for u, v in zip(old, old[1:]) if u != v}
+        new_edges = {
+            (min(u, v), max(u, v)) for u, v in zip(vertices, vertices[1:]) if u != v
+        }
+        for edge in old_edges - new_edges:
+            count = self._edge_count[edge] - 1
+            if count:
+                self._edge_count[edge] = count
+                continue
+            del self._edge_count[edge]
+            self._touch(*edge)
+            self._adjacency[edge[0]].discard(edge[1])
+            self._adjacency[edge[1]].discard(edge[0])
+        for edge in new_edges - old_edges:
+            count = self._edge_count.get(edge, 0)
+            self._edge_count[edge] = count + 1
+            if count:
+                continue
+            self._touch(*edge)
+            self._adjacency.setdefault(edge[0], set()).add(edge[1])
+            self._adjacency.setdefault(edge[1], set()).add(edge[0])
+            self._dirty.update((edge, edge[::-1]))
+        self._wall_vertices[wall_id] = vertices
+
+    def _touch(self, *vertices: VertexKey) -> None:
+        """Invalidates every face passing through ``vertices``."""
+        for v in vertices:
+            self._rotation.pop(v, None)
+            for u in self._adjacency.get(v, ()):
+                for half_edge in ((u, v), (v, u)):
+                    face_id = self._face_of.get(half_edge)
+                    if face_id is not None:
+                        self._drop_face(face_id)
+
+    def _drop_face(self, face_id: int) -> None:
+        cycle = self._faces.pop(face_id)
+        for half_edge in zip(cycle, cycle[1:] + cycle[:1]):
+            self._face_of.pop(half_edge, None)
+            self._dirty.add(half_edge)
+
+    def _neighbors_ccw(self, v: VertexKey) -> list[VertexKey]:
+        rotation = self._rotation.get(v)
+        if rotation is None:
+            rotation = sorted(
+                self._adjacency.get(v, ()),
+                key=lambda u: math.atan2(u[1] - v[1], u[0] - v[0]),
+            )
+            self._rotation[v] = rotation
+        return rotation
+
+    def _retrace(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        for half_edge in dirty:
+            u, v = half_edge
+            if half_edge in self._face_of or v not in self._adjacency.get(u, ()):
+                continue
+            self._trace(half_edge)
+
+    def _trace(self, start: HalfEdge) -> None:
+        face_id = self._next_face
+        self._next_face += 1
+        cycle = []
+        half_edge = start
+        while True:
+            u, v = half_edge
+            self._face_of[half_edge] = face_id
+            cycle.append(u)
+            rotation = self._neighbors_ccw(v)
+            w = rotation[rotation.index(u) - 1]
+            half_edge = (v, w)
+            if half_edge == start:
+                break
+        self._faces[face_id] = cycle
+
+    @staticmethod
+    def _signed_area_centroid(cycle: list[VertexKey]) -> tuple[float, float, float]:
+        """Returns (area in sq ft, centroid x, centroid y in grid units).
+
+        Bounded faces come out with positive area; the unbounded face around
+        each connected group of walls comes out negative (minus the area of
+        its outline), and wall stubs come out zero.
+        """
+        step = CanvasConfig.COORD_PRECISION_FT
+        ox, oy = cycle[0]
+        twice_area = cx = cy = 0.0
+        for (x0, y0), (x1, y1) in zip(cycle, cycle[1:] + cycle[:1]):
+            x0, y0, x1, y1 = x0 - ox, y0 - oy, x1 - ox, y1 - oy
+            cross = x0 * y1 - x1 * y0
+            twice_area += cross
+            cx += (x0 + x1) * cross
+            cy += (y0 + y1) * cross
+        if twice_area == 0:
+            return 0.0, float(ox), float(oy)
+        return (
+            twice_area / 2 * step * step,
+            ox + cx / (3 * twice_area),
+            oy + cy / (3 * twice_area),
+        )
+
+    def _cells_for(self, a: Point, b: Point) -> list[tuple[int, int]]:
+        eps = CanvasConfig.COORD_PRECISION_FT
+        x0, x1 = min(a["x"], b["x"]) - eps, max(a["x"], b["x"]) + eps
+        y0, y1 = min(a["y"], b["y"]) - eps, max(a["y"], b["y"]) + eps
+        return [
+            (i, j)
+            for i in range(
+                math.floor(x0 / INDEX_CELL_FT), math.floor(x1 / INDEX_CELL_FT) + 1
+            )
+            for j in range(
+                math.floor(y0 / INDEX_CELL_FT), math.floor(y1 / INDEX_CELL_FT) + 1
+            )
+        ]
+
+    def _index(self, wall_id: str, a: Point, b: Point) -> None:
+        for cell in self._cells_for(a, b):
+            self._cells.setdefault(cell, set()).add(wall_id)
+
+    def _candidates(self, a: Point, b: Point) -> set[str]:
+        found = set()
+        for cell in self._cells_for(a, b):
+            found.update(self._cells.get(cell, ()))
+        return found
@@ -1,39 +1,64 @@
 import reflex as rx
-from typing import TypedDict, Literal
+from reflex.istate.proxy import MutableProxy
+import asyncio
+from concurrent.futures import CancelledError
 import time
+from app.core.constraints import (
+    DIMENSION_FIELDS,
+    ShapeIndex,
+    constrain_box,
+    shape_box,
+    solve_box_edit,
+)
+from app.core.models import (
+    Layer,
+    Point,
+    Project,
+    Room,
+    Shape,
+    SymbolInstance,
+    TransformHandle,
+    ViewTransform,
+    CanvasConfig,
+)
+from app.core.geometry import (
+    bounds,
+    format_path,
+    format_points,
+    hit_test,
+    plot_viewbox,
+    quantize_point,
+    snap_to_vertex,
+)
+from app.core.project import dumps_project, make_project
+from app.core.symbols import SYMBOLS_BY_ID
+from app.core.transform import (
+    HANDLE_CURSORS,
+    VertexBatch,
+    handle_at,
+    handle_matrix,
+    handle_positions,
+    svg_matrix,
+)
+from app.core.wall_graph import WallGraph, wall_segments
 
 
-class Point(TypedDict):
-    x: float
-    y: float
+EXPORT_CACHE_DIR = "export_cache"
+PREVIEW_CACHE_DIR = "preview_cache"
+EXPORT_PROGRESS_INTERVAL_S = 0.25
+PREVIEW_EDIT_SETTLE_S = 0.5
+DEFAULT_LAYERS = ["plot", "default"]
 
 
-class Shape(TypedDict):
-    id: str
-    type: Literal["rectangle", "polygon", "line", "freehand"]
-    points: list[Point]
-    stroke_mm: float
-    stroke_color: str
-    fill_color: str
-    layer: str
-    label_visibility: bool
-    is_closed: bool
-    area: float
-
-
-class ViewTransform(TypedDict):
-    scale: float
-    offset_x: float
-    offset_y: float
-
-
-class CanvasConfig:
-    A2_WIDTH_FT = 1.378333
-    A2_HEIGHT_FT = 1.949167
-    PLOT_SCALE = 3.1
-    MM_PER_INCH = 25.4
-    SNAP_THRESHOLD_FT = 0.5
-    EDITING_DPI = 96
+def _svg_geometry(shape: Shape) -> str:
+    """Freehand strokes render as path data (delta-encoded once long enough);
+    everything else as a ``points`` list."""
+    if shape["type"] == "freehand":
+        return format_path(
+            shape["points"],
+            relative=len(shape["points"]) >= CanvasConfig.DELTA_ENCODE_MIN_POINTS,
+        )
+    return format_points(shape["points"])
 
 
 class MainState(rx.State):
@@ -56,8 +81,18 @@ class MainState(rx.State):
         },
         {"id": 4, "title": "Export/Save", "prompt": "Save your project or export it."},
     ]
-    shapes: list[Shape] = []
+    layer_order: list[str] = DEFAULT_LAYERS
+    hidden_layers: list[str] = []
+    locked_layers: list[str] = []
+    _layer_shapes: dict[str, list[Shape]] = {}
+    _layer_instances: dict[str, list[SymbolInstance]] = {}
+    _wall_graph: WallGraph | None = None
+    active_symbol_id: str = "door"
+    symbol_rotation_deg: float = 0.0
     selected_shape_id: str | None = None
+    selected_shape_ids: list[str] = []
+    dimension_inputs: dict[str, str] = {field: "" for field in DIMENSION_FIELDS}
+    _shape_index: ShapeIndex | None = None
     view_transform: ViewTransform = {"scale": 1.0, "offset_x": 0.0, "offset_y": 0.0}
     active_tool: str = "select"
     is_panning: bool = False
@@ -73,19 +108,90 @@ class MainState(rx.State):
     drawing_shape: Shape | None = None
     is_drawing: bool = False
     active_handle: str | None = None
+    drag_transform: str = ""
+    _drag_batch: VertexBatch | None = None
+    _drag_start: Point | None = None
+    _drag_matrix: list[list[float]] | None = None
     pan_start: Point | None = None
+    is_exporting: bool = False
+    export_units_done: int = 0
+    export_units_total: int = 0
+    export_bytes_written: int = 0
+    _export_cancel_requested: bool = False
+    preview_url: str = ""
+    preview_dpi: int = 0
+    is_preview_refining: bool = False
+    _preview_generation: int = 0
+    _preview_stale: bool = False
+    _preview_edits: int = 0
+
+    @rx.var
+    def shapes(self) -> list[Shape]:
+        """Shapes on visible layers in layer order; hidden layers are never
+        sent to the browser."""
+        visible = []
+        for name in self.layer_order:
+            if name not in self.hidden_layers:
+                visible.extend(self._layer_shapes.get(name, []))
+        return visible
+
+    @rx.var
+    def rooms(self) -> list[Room]:
+        """Enclosed areas formed by line-tool walls."""
+        if self._wall_graph is None:
+            return []
+        return self._wall_graph.rooms()
+
+    @rx.var
+    def symbol_instances(self) -> list[SymbolInstance]:
+        """Symbol placements on visible layers; the canvas draws each one as a
+        ``<use>`` of the shared library definition."""
+        visible = []
+        for name in self.layer_order:
+            if name not in self.hidden_layers:
+                visible.extend(self._layer_instances.get(name, []))
+        return visible
+
+    @rx.var
+    def layers(self) -> list[Layer]:
+        return [
+            {
+                "name": name,
+                "visible": name not in self.hidden_layers,
+                "locked": name in self.locked_layers,
+            }
+            for name in self.layer_order
+        ]
+
+    @rx.var
+    def layer_counts(self) -> dict[str, int]:
+        counts = {name: len(shapes) for name, shapes in self._layer_shapes.items()}
+        for name, instances in self._layer_instances.items():
+            counts[name] = counts.get(name, 0) + len(instances)
+        return counts
+
+    @rx.var
+    def export_progress_percent(self) -> int:
+        if self.export_units_total == 0:
+            return 0
+        return int(100 * self.export_units_done / self.export_units_total)
+
+    @rx.var
+    def export_progress_label(self) -> str:
+        return (
+            f"{self.export_units_done}/{self.export_units_total} tiles, "
+            f"{self.export_bytes_written / 1024:.0f} KiB written"
+        )
 
     @rx.var
     def svg_points(self) -> dict[str, str]:
         points_map = {}
         for shape in self.shapes:
-            points_map[shape["id"]] = " ".join(
-                [f"{p['x']},{p['y']}" for p in shape["points"]]
-            )
+            points_map[shape["id"]] = _svg_geometry(shape)
         if self.drawing_shape:
-            points_map[self.drawing_shape["id"]] = " ".join(
-                [f"{p['x']},{p['y']}" for p in self.drawing_shape["points"]]
-            )
+            points_map[self.drawing_shape["id"]] = _svg_geometry(self.drawing_shape)
+        for room in self.rooms:
+            points_map[room["id"]] = format_points(room["points"])
         return points_map
 
     @rx.var
@@ -98,26 +204,68 @@ class MainState(rx.State):
 
             logging.exception(f"Error converting plot dimensions: {e}")
             plot_width, plot_height = (1, 1)
-        padding_x = plot_width * 0.1
-        padding_y = plot_height * 0.1
-        base_x = -padding_x
-        base_y = -padding_y
-        base_w = plot_width + 2 * padding_x
-        base_h = plot_height + 2 * padding_y
-        w = base_w / self.view_transform["scale"]
-        h = base_h / self.view_transform["scale"]
-        x = base_x + self.view_transform["offset_x"]
-        y = base_y + self.view_transform["offset_y"]
+        x, y, w, h = plot_viewbox(plot_width, plot_height, self.view_transform)
         return f"{x} {y} {w} {h}"
 
     @rx.var
     def canvas_cursor(self) -> str:
         if self.active_tool == "pan":
             return "grab" if not self.is_panning else "grabbing"
-        if self.active_tool in ["line", "polygon", "rectangle", "freehand"]:
+        if self.active_tool in ["line", "polygon", "rectangle", "freehand", "symbol"]:
             return "crosshair"
         return "default"
 
+    @rx.var
+    def selected_shapes(self) -> list[Shape]:
+        selected = set(self.selected_shape_ids)
+        return [s for s in self.shapes if s["id"] in selected]
+
+    @rx.var
+    def transformable_shapes(self) -> list[Shape]:
+        """Selected shapes the transform handles act on. The plot boundary is
+        sized through the plot dimensions, and locked layers stay put."""
+        return [
+            s
+            for s in self.selected_shapes
+            if s["layer"] != "plot" and s["layer"] not in self.locked_layers
+        ]
+
+    @rx.var
+    def can_edit_dimensions(self) -> bool:
+        return any(s["id"] == self.selected_shape_id for s in self.transformable_shapes)
+
+    @rx.var
+    def selection_box_points(self) -> str:
+        box = self._selection_box()
+        if box is None:
+            return ""
+        x0, y0, x1, y1 = box
+        return format_points(
+            [
+                {"x": x0, "y": y0},
+                {"x": x1, "y": y0},
+                {"x": x1, "y": y1},
+                {"x": x0, "y": y1},
+            ]
+        )
+
+    @rx.var
+    def selection_handles(self) -> list[TransformHandle]:
+        box = self._selection_box()
+        if box is None:
+            return []
+        size = self._handle_size()
+        return [
+            {
+                "name": name,
+                "x": p["x"] - size / 2,
+                "y": p["y"] - size / 2,
+                "size": size,
+                "cursor": HANDLE_CURSORS[name],
+            }
+            for name, p in handle_positions(box, size).items()
+        ]
+
     @rx.var
     def is_step_1_valid(self) -> bool:
         plot_shape = self._get_plot_shape()
@@ -128,13 +276,14 @@ class MainState(rx.State):
         return any(
             (
                 s["type"] == "rectangle" and s["id"] != "plot_boundary"
-                for s in self.shapes
+                for shapes in self._layer_shapes.values()
+                for s in shapes
             )
         )
 
     @rx.var
     def is_step_4_valid(self) -> bool:
-        return len(self.shapes) > 0
+        return any(self._layer_shapes.values()) or any(self._layer_instances.values())
 
     @rx.var
     def can_proceed(self) -> bool:
@@ -159,6 +308,8 @@ class MainState(rx.State):
     def next_step(self):
         if self.current_step < 4 and self.can_proceed:
             self.current_step += 1
+            if self.current_step == 4:
+                return MainState.refresh_preview
 
     @rx.event
     def prev_step(self):
@@ -171,12 +322,44 @@ class MainState(rx.State):
             self.current_step = step_id
         elif self.can_proceed and step_id == self.current_step + 1:
             self.current_step = step_id
+            if step_id == 4:
+                return MainState.refresh_preview
+
+    @rx.event
+    def set_plot_width_ft(self, value: str):
+        self.plot_width_ft = value
+
+    @rx.event
+    def set_plot_height_ft(self, value: str):
+        self.plot_height_ft = value
+
+    @rx.event
+    def set_export_dpi(self, value: str):
+        self.export_dpi = value
+
+    @rx.event
+    def set_export_format(self, value: str):
+        self.export_format = value
+
+    @rx.event
+    def set_lock_aspect_ratio(self, value: bool):
+        self.lock_aspect_ratio = value
 
     @rx.event
     def set_active_tool(self, tool_name: str):
         self.active_tool = tool_name
         self.is_panning = tool_name == "pan"
 
+    @rx.event
+    def select_symbol(self, symbol_id: str):
+        if symbol_id in SYMBOLS_BY_ID:
+            self.active_symbol_id = symbol_id
+            self.set_active_tool("symbol")
+
+    @rx.event
+    def rotate_symbol(self):
+        self.symbol_rotation_deg = (self.symbol_rotation_deg + 90.0) % 360.0
+
     @rx.event
     def toggle_grid(self):
         self.is_grid_visible = not self.is_grid_visible
@@ -185,6 +368,308 @@ class MainState(rx.State):
     def toggle_snap(self):
         self.is_snap_enabled = not self.is_snap_enabled
 
+    @rx.event
+    def toggle_layer_visibility(self, name: str):
+        self._preview_stale = True
+        if name in self.hidden_layers:
+            self.hidden_layers = [n for n in self.hidden_layers if n != name]
+            return self._preview_refresh()
+        self.hidden_layers = self.hidden_layers + [name]
+        self._deselect_layer(name)
+        return self._preview_refresh()
+
+    @rx.event
+    def toggle_layer_lock(self, name: str):
+        if name in self.locked_layers:
+            self.locked_layers = [n for n in self.locked_layers if n != name]
+        else:
+            self.locked_layers = self.locked_layers + [name]
+            self._deselect_layer(name)
+
+    def _select(self, ids: list[str]):
+        self.selected_shape_ids = ids
+        self.selected_shape_id = ids[-1] if ids else None
+        self._sync_dimension_inputs()
+
+    def _get_shape_index(self) -> ShapeIndex:
+        index = self._raw("_shape_index")
+        if index is None:
+            index = ShapeIndex(self._all_shapes())
+            self._shape_index = index
+        return index
+
+    def _sync_dimension_inputs(self, keep: str | None = None):
+        """Shows the selected shape's box in the X/Y/W/H fields, leaving the
+        field being typed into (``keep``) as entered."""
+        shape = (
+            self._get_shape_index().get(self.selected_shape_id)
+            if self.selected_shape_id
+            else None
+        )
+        if shape is None:
+            values = {field: "" for field in DIMENSION_FIELDS}
+        else:
+            x0, y0, x1, y1 = shape_box(shape)
+            values = {
+                "x": f"{x0:.2f}",
+                "y": f"{y0:.2f}",
+                "w": f"{x1 - x0:.2f}",
+                "h": f"{y1 - y0:.2f}",
+            }
+        if keep is not None:
+            values[keep] = self.dimension_inputs[keep]
+        self.dimension_inputs = values
+
+    @rx.event
+    def set_dimension(self, field: str, value: str):
+        """Applies an X/Y/W/H edit to the selected shape, re-solving the
+        aspect lock, plot bounds and attached walls around it only. The plot
+        boundary and shapes on hidden or locked layers are not editable."""
+        if field not in DIMENSION_FIELDS or not self.can_edit_dimensions:
+            return
+        self.dimension_inputs = {**self.dimension_inputs, field: value}
+        try:
+            number = float(value)
+        except ValueError:
+            return
+        if field in ("w", "h") and number <= 0:
+            return
+        index = self._get_shape_index()
+        shape = index.get(self.selected_shape_id)
+        if shape is None:
+            return
+        plot = self._get_plot_shape()
+        plot_box = shape_box(plot) if plot is not None else None
+        old_box = shape_box(shape)
+        new_box = constrain_box(
+            old_box, field, number, self.lock_aspect_ratio, plot_box
+        )
+        skipped = set(self.hidden_layers) | set(self.locked_layers) | {"plot"}
+        neighbors = [
+            s
+            for s in index.near(old_box, CanvasConfig.COORD_PRECISION_FT)
+            if s["id"] != shape["id"] and s["layer"] not in skipped
+        ]
+        self._replace_shapes(solve_box_edit(shape, new_box, neighbors))
+        self._sync_dimension_inputs(keep=field)
+        return self._preview_refresh()
+
+    @rx.event
+    def refresh_dimension_inputs(self):
+        self._sync_dimension_inputs()
+
+    def _update_selected(self, **fields):
+        index = self._get_shape_index()
+        shapes = [index.get(i) for i in self.selected_shape_ids]
+        self._replace_shapes([{**s, **fields} for s in shapes if s is not None])
+
+    @rx.event
+    def set_shape_stroke(self, value: str):
+        try:
+            stroke_mm = float(value)
+        except ValueError:
+            return
+        if stroke_mm > 0:
+            self._update_selected(stroke_mm=stroke_mm)
+            return self._preview_refresh()
+
+    @rx.event
+    def set_shape_color(self, value: str):
+        self._update_selected(stroke_color=value)
+        return self._preview_refresh()
+
+    @rx.event
+    def toggle_shape_labels(self):
+        shape = self.selected_shape
+        if shape is not None:
+            self._update_selected(label_visibility=not shape["label_visibility"])
+            return self._preview_refresh()
+
+    @rx.event
+    def set_shape_layer(self, name: str):
+        """Moves the selected shapes to layer ``name``, creating it if needed."""
+        name = name.strip()
+        if not name or name == "plot":
+            return
+        index = self._get_shape_index()
+        selected = [index.get(i) for i in self.selected_shape_ids]
+        moving = [s for s in selected if s is not None and s["layer"] != name]
+        if not moving:
+            return
+        moving_ids = {s["id"] for s in moving}
+        layer_shapes = dict(self._raw("_layer_shapes"))
+        for old in {s["layer"] for s in moving}:
+            layer_shapes[old] = [
+                s for s in layer_shapes.get(old, []) if s["id"] not in moving_ids
+            ]
+        self._layer_shapes = layer_shapes
+        self._add_shapes([{**s, "layer": name} for s in moving])
+        return self._preview_refresh()
+
+    def _deselect_layer(self, name: str):
+        layer_ids = {s["id"] for s in self._raw("_layer_shapes").get(name, [])}
+        if any(i in layer_ids for i in self.selected_shape_ids):
+            self._select([i for i in self.selected_shape_ids if i not in layer_ids])
+
+    def _selection_box(self) -> tuple[float, float, float, float] | None:
+        points = [p for s in self.transformable_shapes for p in s["points"]]
+        return bounds(points) if points else None
+
+    def _handle_size(self) -> float:
+        return CanvasConfig.HANDLE_SIZE_FT / max(self.view_transform["scale"], 0.1)
+
+    def _begin_transform(self, point: Point) -> bool:
+        """Starts a handle drag if ``point`` is on a handle of the selection."""
+        box = self._selection_box()
+        if box is None:
+            return False
+        handle = handle_at(box, point, self._handle_size())
+        if handle is None:
+            return False
+        movable = {s["id"] for s in self.transformable_shapes}
+        self.active_handle = handle
+        self._drag_start = point
+        self._drag_batch = VertexBatch(
+            [s for s in self._interactive_shapes() if s["id"] in movable]
+        )
+        self._drag_matrix = None
+        return True
+
+    def _end_transform(self, commit: bool):
+        """Applies the last drag matrix to every selected vertex at once."""
+        batch = self._raw("_drag_batch")
+        matrix = self._raw("_drag_matrix")
+        if commit and batch is not None and matrix is not None:
+            self._replace_shapes(batch.apply(matrix))
+            self._sync_dimension_inputs()
+        self.active_handle = None
+        self.drag_transform = ""
+        self._drag_batch = None
+        self._drag_start = None
+        self._drag_matrix = None
+
+    def _replace_shapes(self, shapes: list[Shape]):
+        """Swaps edited shapes into their layers in a single state update."""
+        self._preview_stale = True
+        by_id = {s["id"]: s for s in shapes}
+        layer_shapes = dict(self._raw("_layer_shapes"))
+        for name in {s["layer"] for s in shapes}:
+            layer_shapes[name] = [
+                by_id.get(s["id"], s) for s in layer_shapes.get(name, [])
+            ]
+        self._layer_shapes = layer_shapes
+        index = self._raw("_shape_index")
+        if index is not None:
+            for shape in shapes:
+                index.add(shape)
+            self._shape_index = index
+        graph = self._raw("_wall_graph")
+        moved = wall_segments(shapes)
+        if graph is not None and moved:
+            for wall in moved:
+                graph.move_wall(*wall)
+            self._wall_graph = graph
+
+    def _raw(self, name: str):
+        """Returns state var ``name`` without its MutableProxy wrapper.
+
+        Copy-on-write helpers copy from this so plain values, not proxies,
+        end up in the new value assigned back to state. Computed vars must
+        not call it: dependency tracking cannot see a name passed as a
+        string, so the var would never be recomputed.
+        """
+        value = getattr(self, name)
+        return value.__wrapped__ if isinstance(value, MutableProxy) else value
+
+    def _all_shapes(self) -> list[Shape]:
+        """Returns shapes on every layer, including hidden ones."""
+        layer_shapes = self._raw("_layer_shapes")
+        return [s for name in self.layer_order for s in layer_shapes.get(name, [])]
+
+    def _interactive_shapes(self) -> list[Shape]:
+        """Returns shapes that can be hit-tested and snapped to: those on
+        visible, unlocked layers."""
+        layer_shapes = self._raw("_layer_shapes")
+        skipped = set(self.hidden_layers) | set(self.locked_layers)
+        return [
+            s
+            for name in self.layer_order
+            if name not in skipped
+            for s in layer_shapes.get(name, [])
+        ]
+
+    def _add_shapes(self, shapes: list[Shape]):
+        """Appends shapes to their layers in a single state update, creating
+        any layers not seen before."""
+        self._preview_stale = True
+        layer_shapes = dict(self._raw("_layer_shapes"))
+        known = set(self.layer_order)
+        new_layers = []
+        touched = set()
+        for shape in shapes:
+            name = shape["layer"]
+            if name not in touched:
+                touched.add(name)
+                layer_shapes[name] = list(layer_shapes.get(name, []))
+                if name not in known:
+                    new_layers.append(name)
+            layer_shapes[name].append(shape)
+        if new_layers:
+            self.layer_order = self.layer_order + new_layers
+        self._layer_shapes = layer_shapes
+        index = self._raw("_shape_index")
+        if index is not None:
+            for shape in shapes:
+                index.add(shape)
+            self._shape_index = index
+        self._update_wall_graph(wall_segments(shapes))
+
+    def _update_wall_graph(self, added: list[tuple[str, Point, Point]]):
+        """Adds walls to the room graph: one at a time while drawing, or a
+        full sweep-line rebuild when a batch outnumbers the existing walls."""
+        if not added:
+            return
+        graph = self._raw("_wall_graph")
+        if graph is None or len(added) > len(graph):
+            graph = WallGraph.from_segments(wall_segments(self._all_shapes()))
+        else:
+            for wall in added:
+                graph.add_wall(*wall)
+        self._wall_graph = graph
+
+    def _add_instances(self, instances: list[SymbolInstance]):
+        """Appends symbol placements to their layers in a single state update."""
+        self._preview_stale = True
+        layer_instances = dict(self._raw("_layer_instances"))
+        new_layers = []
+        for instance in instances:
+            name = instance["layer"]
+            layer_instances[name] = layer_instances.get(name, []) + [instance]
+            if name not in self.layer_order and name not in new_layers:
+                new_layers.append(name)
+        if new_layers:
+            self.layer_order = self.layer_order + new_layers
+        self._layer_instances = layer_instances
+
+    def _all_instances(self) -> list[SymbolInstance]:
+        layer_instances = self._raw("_layer_instances")
+        return [i for name in self.layer_order for i in layer_instances.get(name, [])]
+
+    def _finished_drawing_shape(self) -> Shape:
+        """Returns a plain copy of the in-progress shape for committing."""
+        shape = self._raw("drawing_shape")
+        return {
+            **shape,
+            "points": [{"x": p["x"], "y": p["y"]} for p in shape["points"]],
+        }
+
+    def _snap(self, point: Point) -> Point:
+        if not self.is_snap_enabled:
+            return point
+        return snap_to_vertex(
+            self._interactive_shapes(), point, CanvasConfig.SNAP_THRESHOLD_FT
+        )
+
     def _canvas_to_world(self, canvas_point: Point) -> Point:
         viewbox = self.viewbox_str.split()
         try:
@@ -194,10 +679,12 @@ class MainState(rx.State):
 
             logging.exception(f"Error parsing viewbox string: {e}")
             vb_x, vb_y, vb_w, vb_h = (0, 0, 1, 1)
-        return {
-            "x": vb_x + canvas_point["x"] * vb_w,
-            "y": vb_y + canvas_point["y"] * vb_h,
-        }
+        return quantize_point(
+            {
+                "x": vb_x + canvas_point["x"] * vb_w,
+                "y": vb_y + canvas_point["y"] * vb_h,
+            }
+        )
 
     def _event_to_canvas_coords(self, event: dict) -> Point:
         client_x = event.get("client_x", 0)
@@ -225,9 +712,12 @@ class MainState(rx.State):
             self.is_panning = True
             self.pan_start = point
             return
+        if self.active_tool == "select" and self._begin_transform(point):
+            return
         self.is_drawing = True
         shape_type = self.active_tool
         if shape_type in ["rectangle", "line", "polygon", "freehand"]:
+            point = self._snap(point)
             new_shape = {
                 "id": f"shape_{int(time.time() * 1000000)}",
                 "type": shape_type,
@@ -253,6 +743,19 @@ class MainState(rx.State):
         """Handle mouse move events on the canvas."""
         canvas_coords = self._event_to_canvas_coords(event)
         point = self._canvas_to_world(canvas_coords)
+        if self.active_handle is not None and self._drag_start is not None:
+            matrix = handle_matrix(
+                self.active_handle,
+                self._raw("_drag_batch").bounds(),
+                self._drag_start,
+                point,
+                lock_aspect=self.lock_aspect_ratio or event.get("shift_key", False),
+                symmetric=event.get("alt_key", False),
+                shear=event.get("shift_key", False),
+            )
+            self._drag_matrix = matrix.tolist()
+            self.drag_transform = svg_matrix(matrix)
+            return
         if self.is_panning and self.pan_start:
             delta_x = self.pan_start["x"] - point["x"]
             delta_y = self.pan_start["y"] - point["y"]
@@ -260,6 +763,7 @@ class MainState(rx.State):
             self.view_transform["offset_y"] += delta_y
             return
         if self.is_drawing and self.drawing_shape:
+            point = self._snap(point)
             if self.active_tool == "rectangle":
                 start_point = self.drawing_shape["points"][0]
                 self.drawing_shape["points"] = [
@@ -280,17 +784,51 @@ class MainState(rx.State):
     def handle_canvas_mouse_up(self, event: dict):
         """Handle mouse up events on the canvas."""
         button = event.get("button", 0)
+        if self.active_handle is not None:
+            self._end_transform(commit=True)
+            return self._preview_refresh()
         if self.is_panning:
             self.is_panning = False
             self.pan_start = None
             return
         if not self.is_drawing or not self.drawing_shape:
+            self.is_drawing = False
             if self.active_tool == "select":
-                self.selected_shape_id = None
+                point = self._canvas_to_world(self._event_to_canvas_coords(event))
+                hit = hit_test(
+                    self._interactive_shapes(), point, CanvasConfig.HIT_TOLERANCE_FT
+                )
+                if hit is None:
+                    self._select([])
+                elif not event.get("shift_key", False):
+                    self._select([hit["id"]])
+                elif hit["id"] in self.selected_shape_ids:
+                    self._select([i for i in self.selected_shape_ids if i != hit["id"]])
+                else:
+                    self._select(self.selected_shape_ids + [hit["id"]])
+            elif self.active_tool == "symbol":
+                point = self._snap(
+                    self._canvas_to_world(self._event_to_canvas_coords(event))
+                )
+                self._add_instances(
+                    [
+                        {
+                            "id": f"sym_{int(time.time() * 1000000)}",
+                            "symbol_id": self.active_symbol_id,
+                            "x": point["x"],
+                            "y": point["y"],
+                            "rotation_deg": self.symbol_rotation_deg,
+                            "scale_x": 1.0,
+                            "scale_y": 1.0,
+                            "layer": self.selected_layer,
+                        }
+                    ]
+                )
+                return self._preview_refresh()
             return
         self.is_drawing = False
         canvas_coords = self._event_to_canvas_coords(event)
-        point = self._canvas_to_world(canvas_coords)
+        point = self._snap(self._canvas_to_world(canvas_coords))
         if self.active_tool == "rectangle":
             start_point = self.drawing_shape["points"][0]
             self.drawing_shape["points"] = [
@@ -300,21 +838,24 @@ class MainState(rx.State):
                 {"x": start_point["x"], "y": point["y"]},
             ]
             if start_point["x"] != point["x"] and start_point["y"] != point["y"]:
-                self.shapes.append(self.drawing_shape)
+                self._add_shapes([self._finished_drawing_shape()])
         elif self.active_tool == "line":
             if len(self.drawing_shape["points"]) == 1:
                 self.drawing_shape["points"].append(point)
             elif len(self.drawing_shape["points"]) > 1:
                 self.drawing_shape["points"][1] = point
-            self.shapes.append(self.drawing_shape)
+            self._add_shapes([self._finished_drawing_shape()])
         elif self.active_tool == "freehand":
-            self.shapes.append(self.drawing_shape)
+            self._add_shapes([self._finished_drawing_shape()])
         if self.active_tool != "polygon":
             self.drawing_shape = None
+        return self._preview_refresh()
 
     @rx.event
     def handle_canvas_mouse_leave(self):
         """Handle mouse leave events on the canvas."""
+        if self.active_handle is not None:
+            self._end_transform(commit=False)
         if self.is_drawing:
             self.is_drawing = False
             self.drawing_shape = None
@@ -352,34 +893,227 @@ class MainState(rx.State):
             "is_closed": True,
             "area": width * height,
         }
-        self.shapes.append(new_plot)
-        self.selected_shape_id = "plot_boundary"
+        self._add_shapes([new_plot])
+        self._select(["plot_boundary"])
         return rx.toast.success(f"Created {width:.1f}x{height:.1f} ft plot.")
 
+    @rx.event
+    async def handle_plan_upload(self, files: list[rx.UploadFile]):
+        """Imports DXF/SVG plans and appends them to the canvas in one update."""
+        from app.core.plan_import import detect_format, import_plan
+
+        imported: list[Shape] = []
+        entity_count = 0
+        units = set()
+        loop = asyncio.get_running_loop()
+        for file in files:
+            try:
+                fmt = detect_format(file.filename or "")
+                shapes, reader = await loop.run_in_executor(
+                    None, lambda: import_plan(file.file, fmt)
+                )
+            except (ValueError, SyntaxError) as e:
+                import logging
+
+                logging.exception(f"Error importing plan {file.filename}: {e}")
+                return rx.toast.error(f"Could not import {file.filename}.")
+            imported.extend(shapes)
+            entity_count += reader.entities_read
+            units.add(reader.units or "ft")
+        if not imported:
+            return rx.toast.info("No drawable entities found in the file.")
+        self._add_shapes(imported)
+        return rx.toast.success(
+            f"Imported {len(imported)} shapes from {entity_count} entities ({', '.join(sorted(units))})."
+        )
+
     @rx.event
     def reset_canvas(self):
-        self.shapes = []
-        self.selected_shape_id = None
+        self._layer_shapes = {}
+        self._layer_instances = {}
+        self._wall_graph = None
+        self._shape_index = None
+        self.layer_order = list(DEFAULT_LAYERS)
+        self.hidden_layers = []
+        self.locked_layers = []
+        self._select([])
         self.view_transform = {"scale": 1.0, "offset_x": 0.0, "offset_y": 0.0}
-        return rx.toast.info("Canvas has been cleared.")
+        self._preview_stale = True
+        return [rx.toast.info("Canvas has been cleared."), *self._preview_refresh()]
 
     @rx.event
     def save_project_local(self):
         """Saves the entire project state to the browser's localStorage."""
         return rx.toast.info("Project auto-saved to browser.")
 
+    def _project(self) -> Project:
+        return make_project(
+            self._all_shapes(),
+            self.plot_width_ft,
+            self.plot_height_ft,
+            self.layers,
+            self._all_instances(),
+        )
+
     @rx.event
     def export_project_file(self):
         """Exports the project as a JSON file."""
-        return rx.toast.success("Project JSON exported.")
+        return [
+            rx.download(data=dumps_project(self._project()), filename="floorplan.json"),
+            rx.toast.success("Project JSON exported."),
+        ]
 
-    @rx.event
-    def export_drawing(self):
-        """Exports the drawing as PNG or PDF at the selected DPI."""
-        return rx.toast.success(
-            f"Exporting as {self.export_format.upper()} at {int(self.export_dpi)} DPI..."
+    @rx.event(background=True)
+    async def export_drawing(self):
+        """Exports the drawing as PNG or PDF at the selected DPI.
+
+        Renders are cached on disk by drawing content, so re-exporting an
+        unchanged drawing skips rendering entirely. Misses render on the
+        shared export queue while this task streams progress back, so the
+        canvas stays usable and the export can be cancelled.
+        """
+        from app.core.export import render_project
+        from app.core.export_cache import cache_key, get_export_cache
+        from app.core.export_worker import (
+            ExportCancelled,
+            ExportQueueFull,
+            get_export_queue,
         )
 
+        async with self:
+            # Checked and claimed under one lock so a double-click cannot
+            # start two exports.
+            if self.is_exporting:
+                return rx.toast.info("An export is already running.")
+            self.is_exporting = True
+            self._export_cancel_requested = False
+            self.export_units_done = 0
+            self.export_units_total = 0
+            self.export_bytes_written = 0
+        try:
+            async with self:
+                fmt = self.export_format
+                dpi = int(self.export_dpi)
+                project = self._project()
+            filename = f"floorplan_{dpi}dpi.{fmt}"
+
+            def lookup():
+                # Scanning the cache and hashing a large drawing take long
+                # enough to stall every session, so both run off the loop.
+                cache = get_export_cache(rx.get_upload_dir() / EXPORT_CACHE_DIR)
+                key = cache_key(project, fmt, dpi)
+                return cache, key, cache.get(key, fmt) is not None
+
+            loop = asyncio.get_running_loop()
+            cache, key, hit = await loop.run_in_executor(None, lookup)
+            url = rx.get_upload_url(f"{EXPORT_CACHE_DIR}/{cache.relpath(key, fmt)}")
+            if not hit:
+                try:
+                    job = get_export_queue().submit(
+                        lambda progress: cache.put(
+                            key,
+                            fmt,
+                            lambda out: render_project(
+                                project, fmt, dpi, out, progress
+                            ),
+                        )
+                    )
+                except ExportQueueFull:
+                    return rx.toast.warning("Export queue is busy. Try again shortly.")
+                while not job.done():
+                    await asyncio.sleep(EXPORT_PROGRESS_INTERVAL_S)
+                    async with self:
+                        if self._export_cancel_requested:
+                            job.cancel()
+                        self.export_units_done = job.units_done
+                        self.export_units_total = job.units_total
+                        self.export_bytes_written = job.bytes_written
+                job.future.result()
+        except (ExportCancelled, CancelledError):
+            return rx.toast.info("Export cancelled.")
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Error exporting drawing: {e}")
+            return rx.toast.error(f"Export failed: {e}")
+        finally:
+            async with self:
+                self.is_exporting = False
+        return [
+            rx.download(url=url, filename=filename),
+            rx.toast.success(f"Exported {fmt.upper()} at {dpi} DPI."),
+        ]
+
+    @rx.event(background=True)
+    async def refresh_preview(self):
+        """Shows the export sheet at increasing preview DPIs.
+
+        The coarsest level renders in milliseconds; finer ones replace it as
+        they finish. A newer refresh supersedes this one, and a drawing
+        whose previews are already cached shows the finest one directly.
+        """
+        from app.core.preview import (
+            PREVIEW_DPIS,
+            cached_preview,
+            get_preview_cache,
+            preview_keys,
+            render_preview,
+        )
+
+        async with self:
+            self._preview_generation += 1
+            generation = self._preview_generation
+            project = self._project()
+            self._preview_stale = False
+            self.is_preview_refining = True
+        cache = get_preview_cache(rx.get_upload_dir() / PREVIEW_CACHE_DIR)
+        loop = asyncio.get_running_loop()
+        try:
+            keys = await loop.run_in_executor(None, preview_keys, project)
+            cached = await loop.run_in_executor(None, cached_preview, keys, cache)
+            levels = [dpi for dpi in PREVIEW_DPIS if cached is None or dpi >= cached]
+            for dpi in levels:
+                rel = await loop.run_in_executor(
+                    None, render_preview, project, dpi, keys[dpi], cache
+                )
+                async with self:
+                    if self._preview_generation != generation:
+                        return
+                    self.preview_url = rx.get_upload_url(f"{PREVIEW_CACHE_DIR}/{rel}")
+                    self.preview_dpi = dpi
+        except (ValueError, RuntimeError) as e:
+            import logging
+
+            logging.exception(f"Error rendering preview: {e}")
+        finally:
+            async with self:
+                if self._preview_generation == generation:
+                    self.is_preview_refining = False
+
+    def _preview_refresh(self) -> list:
+        """Returns a debounced preview refresh if the drawing changed while
+        the export step is showing its preview."""
+        if self.current_step == 4 and self._preview_stale:
+            return [MainState.refresh_preview_after_edit]
+        return []
+
+    @rx.event(background=True)
+    async def refresh_preview_after_edit(self):
+        """Refreshes the preview once edits pause for ``PREVIEW_EDIT_SETTLE_S``,
+        so dragging a color or typing a dimension renders once."""
+        async with self:
+            self._preview_edits += 1
+            edit = self._preview_edits
+        await asyncio.sleep(PREVIEW_EDIT_SETTLE_S)
+        async with self:
+            if self._preview_edits != edit or self.current_step != 4:
+                return
+        return MainState.refresh_preview
+
+    @rx.event
+    def cancel_export(self):
+        self._export_cancel_requested = True
+
     @rx.event
     def zoom_in(self):
         new_scale = self.view_transform["scale"] * 1.2
@@ -395,7 +1129,7 @@ class MainState(rx.State):
         self.view_transform["scale"] = new_scale
 
     def _get_plot_shape(self) -> Shape | None:
-        for shape in self.shapes:
+        for shape in self._layer_shapes.get("plot", []):
             if shape["id"] == "plot_boundary":
                 return shape
         return None
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Interaction cost on a dense plan with furniture/annotation layers shown,
+hidden or locked. Mirrors MainState: svg_points serialises visible shapes
+whenever they change, and every pointer event hit-tests/snaps against
+visible, unlocked shapes.
+
+Usage: python -m benchmarks.bench_layers [shapes_per_layer]
+"""
+
+import random
+import sys
+import time
+from app.core.geometry import format_points, hit_test, snap_to_vertex
+from app.core.models import CanvasConfig, Shape
+
+LAYERS = ["plot", "walls", "furniture", "annotation"]
+
+
+def dense_plan(per_layer: int) -> dict[str, list[Shape]]:
+    random.seed(0)
+    plan = {}
+    for layer in LAYERS:
+        shapes = []
+        for i in range(per_layer):
+            x, y = random.uniform(0, 48), random.uniform(0, 88)
+            w, h = random.uniform(0.5, 3), random.uniform(0.5, 3)
+            points = [
+                {"x": x, "y": y},
+                {"x": x + w, "y": y},
+                {"x": x + w, "y": y + h},
+                {"x": x, "y": y + h},
+            ]
+            shapes.append(
+                {
+                    "id": f"{layer}_{i}",
+                    "type": "rectangle",
+                    "points": points,
+                    "stroke_mm": 0.25,
+                    "stroke_color": "#1a1a1a",
+                    "fill_color": "transparent",
+                    "layer": layer,
+                    "label_visibility": False,
+                    "is_closed": True,
+                    "area": w * h,
+                }
+            )
+        plan[layer] = shapes
+    return plan
+
+
+def timings_ms(
+    plan: dict[str, list[Shape]], hidden: set[str], locked: set[str], events: int = 20
+) -> tuple[float, float]:
+    """Returns (svg_points rebuild, hit-test + snap per pointer event) in ms."""
+    visible = [s for name in LAYERS if name not in hidden for s in plan[name]]
+    interactive = [
+        s for name in LAYERS if name not in hidden | locked for s in plan[name]
+    ]
+    start = time.perf_counter()
+    for _ in range(events):
+        {s["id"]: format_points(s["points"]) for s in visible}
+    serialize = (time.perf_counter() - start) * 1000 / events
+    start = time.perf_counter()
+    for i in range(events):
+        point = {"x": (i * 0.97) % 50, "y": (i * 1.73) % 90}
+        hit_test(interactive, point, CanvasConfig.HIT_TOLERANCE_FT)
+        snap_to_vertex(interactive, point, CanvasConfig.SNAP_THRESHOLD_FT)
+    pointer = (time.perf_counter() - start) * 1000 / events
+    return serialize, pointer
+
+
+if __name__ == "__main__":
+    per_layer = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    plan = dense_plan(per_layer)
+    print(f"{'':32s} {'svg_points':>12s} {'hit+snap':>12s}")
+    for label, hidden, locked in (
+        ("all layers shown", set(), set()),
+        ("furniture+annotation locked", set(), {"furniture", "annotation"}),
+        ("furniture+annotation hidden", {"furniture", "annotation"}, set()),
+    ):
+        serialize, pointer = timings_ms(plan, hidden, locked)
+        print(f"{label:32s} {serialize:9.2f} ms {pointer:9.2f} ms")
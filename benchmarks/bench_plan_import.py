@@ -0,0 +1,74 @@
+"""Throughput benchmark for the streaming DXF/SVG plan importer.
+
+Usage: python -m benchmarks.bench_plan_import [entity_count]
+"""
+
+import io
+import math
+import sys
+import time
+import tracemalloc
+from app.core.plan_import import open_reader
+
+
+def synthetic_dxf(entity_count: int) -> bytes:
+    out = io.StringIO()
+    out.write("0\nSECTION\n2\nHEADER\n9\n$INSUNITS\n70\n4\n0\nENDSEC\n")
+    out.write("0\nSECTION\n2\nENTITIES\n")
+    for i in range(entity_count):
+        x, y = (i % 200) * 1000.0, (i // 200) * 1000.0
+        kind = i % 3
+        if kind == 0:
+            out.write(f"0\nLINE\n8\nWALLS\n10\n{x}\n20\n{y}\n11\n{x + 900}\n21\n{y}\n")
+        elif kind == 1:
+            out.write("0\nLWPOLYLINE\n8\nROOMS\n90\n4\n70\n1\n")
+            for dx, dy in ((0, 0), (800, 0), (800, 800), (0, 800)):
+                out.write(f"10\n{x + dx}\n20\n{y + dy}\n")
+        else:
+            out.write(f"0\nARC\n8\nDOORS\n10\n{x}\n20\n{y}\n40\n450\n50\n0\n51\n90\n")
+    out.write("0\nENDSEC\n0\nEOF\n")
+    return out.getvalue().encode()
+
+
+def synthetic_svg(entity_count: int) -> bytes:
+    out = io.StringIO()
+    out.write(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="20000mm" height="20000mm"'
+        ' viewBox="0 0 20000 20000">'
+    )
+    for i in range(entity_count):
+        x, y = (i % 200) * 100.0, (i // 200) * 100.0
+        kind = i % 3
+        if kind == 0:
+            out.write(f'<line x1="{x}" y1="{y}" x2="{x + 90}" y2="{y}"/>')
+        elif kind == 1:
+            out.write(f'<rect x="{x}" y="{y}" width="80" height="80"/>')
+        else:
+            r = 45 * math.sqrt(2)
+            out.write(f'<path d="M{x} {y} A{r} {r} 0 0 1 {x + 90} {y}"/>')
+    out.write("</svg>")
+    return out.getvalue().encode()
+
+
+def run(fmt: str, payload: bytes) -> None:
+    start = time.perf_counter()
+    reader = open_reader(io.BytesIO(payload), fmt)
+    shape_count = sum(1 for _ in reader)
+    elapsed = time.perf_counter() - start
+    # Memory is measured on a second pass: tracemalloc skews the timing.
+    tracemalloc.start()
+    for _ in open_reader(io.BytesIO(payload), fmt):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{fmt.upper()}: {reader.entities_read} entities -> {shape_count} shapes "
+        f"in {elapsed:.3f}s ({reader.entities_read / elapsed:,.0f} entities/s, "
+        f"peak parser memory {peak / 1024:.0f} KiB, input {len(payload) / 1024:.0f} KiB)"
+    )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    run("dxf", synthetic_dxf(count))
+    run("svg", synthetic_svg(count))
@@ -0,0 +1,85 @@
+"""Cold-start profile of the app: what a freshly started worker pays before it
+can serve its first event.
+
+Each run starts a new interpreter and times importing ``app.app``,
+evaluating the page, and handling a first event (creating the plot and
+computing the state delta sent to the browser). The slowest app modules and
+top-level packages are listed from ``python -X importtime``.
+
+Usage: python -m benchmarks.bench_startup [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PHASES = ("import", "page", "first_event")
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app.app
+from app.states.main_state import MainState
+import reflex as rx
+imported = time.perf_counter()
+app.app.index()
+page = time.perf_counter()
+root = rx.State(_reflex_internal_init=True)
+state = root.get_substate(MainState.get_full_name().split(".")[1:])
+state.create_preset_plot()
+root.get_delta()
+event = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "page": page - imported,
+    "first_event": event - page,
+}))
+"""
+
+
+def run_probe() -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 12) -> list[tuple[float, str]]:
+    """Returns (cumulative ms, module) for the slowest app modules and
+    top-level packages imported by ``app.app``."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.app"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        _, cumulative, name = (line.split("|") + ["", ""])[:3]
+        module = name.strip()
+        if cumulative.strip().isdigit() and (
+            module.startswith("app") or "." not in module
+        ):
+            rows.append((int(cumulative) / 1000, module))
+    return sorted(rows, reverse=True)[:limit]
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = [run_probe() for _ in range(runs)]
+    print(f"median of {runs} fresh interpreters")
+    for phase in PHASES:
+        values = [s[phase] * 1000 for s in samples]
+        print(f"  {phase:12s} {statistics.median(values):8.1f} ms")
+    total = statistics.median(sum(s.values()) for s in samples) * 1000
+    print(f"  {'total':12s} {total:8.1f} ms")
+    print("slowest imports (cumulative)")
+    for ms, module in slowest_imports():
+        print(f"  {ms:8.1f} ms  {module}")
@@ -0,0 +1,93 @@
+"""Handle-drag cost for a large multi-selection.
+
+Compares, per pointer move, computing the coalesced drag matrix (what the
+canvas receives while dragging) against rewriting every selected vertex, and
+the one-off commit on release with the packed numpy batch against a
+per-vertex Python loop.
+
+Usage: python -m benchmarks.bench_transform [vertices]
+"""
+
+import math
+import sys
+import time
+from app.core.geometry import format_path, quantize_point
+from app.core.models import Shape
+from app.core.transform import VertexBatch, handle_matrix, svg_matrix
+
+POINTS_PER_STROKE = 100
+
+
+def strokes(vertices: int) -> list[Shape]:
+    shapes = []
+    for i in range(max(1, vertices // POINTS_PER_STROKE)):
+        points = [
+            quantize_point(
+                {"x": 5 + i % 10 * 4 + k * 0.03, "y": 5 + i // 10 * 4 + math.sin(k / 7)}
+            )
+            for k in range(POINTS_PER_STROKE)
+        ]
+        shapes.append(
+            {
+                "id": f"stroke_{i}",
+                "type": "freehand",
+                "points": points,
+                "stroke_mm": 0.25,
+                "stroke_color": "#1a1a1a",
+                "fill_color": "transparent",
+                "layer": "default",
+                "label_visibility": False,
+                "is_closed": False,
+                "area": 0.0,
+            }
+        )
+    return shapes
+
+
+def per_vertex(shapes: list[Shape], m) -> list[Shape]:
+    (a, c, e), (b, d, f) = m[0], m[1]
+    return [
+        {
+            **s,
+            "points": [
+                quantize_point(
+                    {"x": a * p["x"] + c * p["y"] + e, "y": b * p["x"] + d * p["y"] + f}
+                )
+                for p in s["points"]
+            ],
+        }
+        for s in shapes
+    ]
+
+
+def ms(start: float, count: int = 1) -> float:
+    return (time.perf_counter() - start) * 1000 / count
+
+
+if __name__ == "__main__":
+    vertices = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    shapes = strokes(vertices)
+    batch = VertexBatch(shapes)
+    box = batch.bounds()
+    start_point = {"x": box[2], "y": box[3]}
+    moves = [{"x": box[2] + i * 0.05, "y": box[3] + i * 0.04} for i in range(1, 61)]
+    print(f"{len(batch)} vertices in {len(shapes)} shapes, {len(moves)} pointer moves")
+
+    start = time.perf_counter()
+    for p in moves:
+        svg_matrix(handle_matrix("se", batch.bounds(), start_point, p))
+    print(f"coalesced matrix per move       {ms(start, len(moves)):8.3f} ms")
+
+    start = time.perf_counter()
+    for p in moves:
+        moved = per_vertex(shapes, handle_matrix("se", box, start_point, p).tolist())
+        [format_path(s["points"]) for s in moved]
+    print(f"rewrite + serialise per move    {ms(start, len(moves)):8.3f} ms")
+
+    final = handle_matrix("se", box, start_point, moves[-1])
+    start = time.perf_counter()
+    batch.apply(final)
+    print(f"commit, numpy batch             {ms(start):8.3f} ms")
+    start = time.perf_counter()
+    per_vertex(shapes, final.tolist())
+    print(f"commit, per-vertex loop         {ms(start):8.3f} ms")
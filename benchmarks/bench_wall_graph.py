@@ -0,0 +1,96 @@
+"""Wall graph build and edit cost on plans with thousands of wall segments.
+
+The plan is a grid of rooms drawn as one segment per room side (so walls meet
+end to end and in T-junctions), crossed by a few long diagonal walls. Times
+the sweep-line build against brute-force pair testing, and single-wall
+add/move edits against rebuilding the graph after every edit.
+
+Usage: python -m benchmarks.bench_wall_graph [rooms_per_side]
+"""
+
+import random
+import sys
+import time
+from app.core.wall_graph import WallGraph, segment_intersections, sweep_intersections
+
+ROOM_FT = 10.0
+
+
+def grid_plan(n: int) -> list[tuple[str, dict, dict]]:
+    walls = []
+    for i in range(n + 1):
+        for j in range(n):
+            walls.append(
+                (
+                    f"h{i}_{j}",
+                    {"x": j * ROOM_FT, "y": i * ROOM_FT},
+                    {"x": (j + 1) * ROOM_FT, "y": i * ROOM_FT},
+                )
+            )
+            walls.append(
+                (
+                    f"v{i}_{j}",
+                    {"x": i * ROOM_FT, "y": j * ROOM_FT},
+                    {"x": i * ROOM_FT, "y": (j + 1) * ROOM_FT},
+                )
+            )
+    size = n * ROOM_FT
+    for k in range(4):
+        walls.append(
+            (
+                f"d{k}",
+                {"x": 0.5 + k, "y": 0.25},
+                {"x": size - 0.5, "y": size - 0.75 - k},
+            )
+        )
+    return walls
+
+
+def brute_force_pairs(segments: list[tuple[dict, dict]]) -> int:
+    hits = 0
+    for i in range(len(segments)):
+        for j in range(i + 1, len(segments)):
+            if segment_intersections(*segments[i], *segments[j]):
+                hits += 1
+    return hits
+
+
+def ms(start: float, count: int = 1) -> float:
+    return (time.perf_counter() - start) * 1000 / count
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    walls = grid_plan(n)
+    segments = [(a, b) for _, a, b in walls]
+    print(f"{len(walls)} wall segments, {n * n} grid rooms")
+
+    start = time.perf_counter()
+    pairs = len(sweep_intersections(segments))
+    print(f"sweep-line intersections      {ms(start):9.1f} ms  ({pairs} pairs)")
+    if len(segments) <= 4000:
+        start = time.perf_counter()
+        brute_force_pairs(segments)
+        print(f"brute-force intersections     {ms(start):9.1f} ms")
+
+    start = time.perf_counter()
+    graph = WallGraph.from_segments(walls)
+    build = ms(start)
+    print(
+        f"full build                    {build:9.1f} ms  ({len(graph.rooms())} rooms)"
+    )
+
+    random.seed(0)
+    size = n * ROOM_FT
+    edits = 50
+    start = time.perf_counter()
+    for k in range(edits):
+        x = random.uniform(0, size)
+        graph.add_wall(f"new{k}", {"x": x, "y": 0.0}, {"x": x, "y": ROOM_FT * 2})
+    print(f"incremental add_wall          {ms(start, edits):9.3f} ms/edit")
+    start = time.perf_counter()
+    for k in range(edits):
+        x = random.uniform(0, size)
+        graph.move_wall(f"new{k}", {"x": x, "y": 0.0}, {"x": x, "y": ROOM_FT * 2})
+    print(f"incremental move_wall         {ms(start, edits):9.3f} ms/edit")
+    print(f"rebuild per edit              {build:9.3f} ms/edit")
@@ -0,0 +1,34 @@
+import pytest
+from app.core import batch_export
+from app.core.project import dumps_project, make_project
+
+
+@pytest.fixture
+def project_file(tmp_path):
+    path = tmp_path / "plan.json"
+    path.write_text(dumps_project(make_project([], "50", "90")))
+    return path
+
+
+def test_export_one_writes_output(project_file, tmp_path):
+    out_path = tmp_path / "plan.png"
+    _, size = batch_export.export_one(str(project_file), str(out_path), "png", 96)
+    assert out_path.stat().st_size == size
+    assert not (tmp_path / "plan.png.part").exists()
+
+
+def test_failed_export_removes_partial_and_keeps_previous_output(
+    project_file, tmp_path, monkeypatch
+):
+    out_path = tmp_path / "plan.png"
+    out_path.write_bytes(b"previous")
+
+    def fail(project, fmt, dpi, out):
+        out.write(b"half a file")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(batch_export, "render_project", fail)
+    with pytest.raises(OSError):
+        batch_export.export_one(str(project_file), str(out_path), "png", 96)
+    assert out_path.read_bytes() == b"previous"
+    assert not (tmp_path / "plan.png.part").exists()
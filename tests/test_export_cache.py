@@ -0,0 +1,51 @@
+from app.core.export_cache import ExportCache
+
+
+def writer(size: int):
+    return lambda out: out.write(b"x" * size)
+
+
+def disk_bytes(cache: ExportCache) -> int:
+    return sum(p.stat().st_size for p in cache.directory.glob("*/*"))
+
+
+def test_size_bound_holds_across_processes(tmp_path):
+    # Two caches on one directory stand in for two worker processes.
+    a = ExportCache(tmp_path, max_bytes=1000)
+    b = ExportCache(tmp_path, max_bytes=1000)
+    for i in range(6):
+        (a if i % 2 else b).put(f"{i:02d}" * 32, "png", writer(300))
+    assert disk_bytes(a) <= 1000
+    assert a.get("05" * 32, "png") is not None
+
+
+def test_entry_written_by_another_process_is_a_hit(tmp_path):
+    a = ExportCache(tmp_path)
+    b = ExportCache(tmp_path)
+    a.put("ab" * 32, "png", writer(10))
+    assert b.get("ab" * 32, "png") is not None
+    assert b.stats()["hits"] == 1
+
+
+def test_entry_evicted_by_another_process_is_a_miss(tmp_path):
+    a = ExportCache(tmp_path)
+    b = ExportCache(tmp_path)
+    path = a.put("cd" * 32, "png", writer(10))
+    assert b.get("cd" * 32, "png") is not None
+    path.unlink()
+    assert b.get("cd" * 32, "png") is None
+    stats = b.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 0)
+
+
+def test_lookups_log_cache_stats(tmp_path, caplog):
+    cache = ExportCache(tmp_path)
+    with caplog.at_level("INFO", logger="app.core.export_cache"):
+        cache.get("ef" * 32, "png")
+        cache.put("ef" * 32, "png", writer(10))
+        cache.get("ef" * 32, "png")
+    assert [r.getMessage().split(":")[0].split()[1] for r in caplog.records] == [
+        "miss",
+        "hit",
+    ]
+    assert "1 hits, 1 misses (50% hit rate)" in caplog.records[-1].getMessage()
@@ -0,0 +1,97 @@
+import threading
+import pytest
+from app.core.export import render_project
+from app.core.export_cache import ExportCache
+from app.core.export_worker import ExportCancelled, ExportQueue, ExportQueueFull
+from app.core.project import make_project
+
+TIMEOUT_S = 5
+
+
+def blocker(release: threading.Event):
+    return lambda progress: release.wait(TIMEOUT_S)
+
+
+def fill(queue: ExportQueue, release: threading.Event) -> list:
+    """Submits blocking jobs until the queue is full; returns them."""
+    jobs = []
+    while True:
+        try:
+            jobs.append(queue.submit(blocker(release)))
+        except ExportQueueFull:
+            return jobs
+
+
+def test_full_queue_rejects_submissions():
+    queue = ExportQueue(max_workers=1, max_pending=2)
+    release = threading.Event()
+    jobs = fill(queue, release)
+    assert len(jobs) == 2
+    with pytest.raises(ExportQueueFull):
+        queue.submit(blocker(release))
+    release.set()
+    for job in jobs:
+        job.future.result(TIMEOUT_S)
+    assert len(fill(queue, threading.Event())) == 2
+
+
+def test_cancel_before_start_releases_slot_once():
+    queue = ExportQueue(max_workers=1, max_pending=3)
+    release = threading.Event()
+    running = queue.submit(blocker(release))
+    waiting = queue.submit(blocker(release))
+    waiting.cancel()
+    assert waiting.future.cancelled()
+    release.set()
+    running.future.result(TIMEOUT_S)
+    # Exactly the configured slots are free again: a double release would
+    # allow a fourth job (or raise in the semaphore).
+    more = threading.Event()
+    assert len(fill(queue, more)) == 3
+    more.set()
+
+
+def test_cancel_mid_render_removes_partial_file(tmp_path):
+    queue = ExportQueue(max_workers=1, max_pending=1)
+    cache = ExportCache(tmp_path)
+    project = make_project([], "50", "90")
+    first_band = threading.Event()
+    proceed = threading.Event()
+
+    def render(progress):
+        def report(done, total, written):
+            progress(done, total, written)
+            first_band.set()
+            proceed.wait(TIMEOUT_S)
+
+        return cache.put(
+            "ab" * 32,
+            "png",
+            lambda out: render_project(project, "png", 96, out, report),
+        )
+
+    job = queue.submit(render)
+    assert first_band.wait(TIMEOUT_S)
+    assert list(tmp_path.glob("*/*.part"))
+    job.cancel()
+    proceed.set()
+    with pytest.raises(ExportCancelled):
+        job.future.result(TIMEOUT_S)
+    assert list(tmp_path.glob("*/*")) == []
+    assert not cache.contains("ab" * 32, "png")
+
+
+def test_slots_recover_after_failures():
+    queue = ExportQueue(max_workers=2, max_pending=2)
+
+    def fail(progress):
+        raise ValueError("render failed")
+
+    for _ in range(5):
+        jobs = [queue.submit(fail), queue.submit(fail)]
+        for job in jobs:
+            with pytest.raises(ValueError):
+                job.future.result(TIMEOUT_S)
+    release = threading.Event()
+    assert len(fill(queue, release)) == 2
+    release.set()
@@ -0,0 +1,78 @@
+import math
+import random
+import re
+import pytest
+from app.core.geometry import format_path, format_points, quantize, quantize_point
+from app.core.models import CanvasConfig
+
+PRECISION = CanvasConfig.COORD_PRECISION_FT
+NUMBER_RE = re.compile(r"[-+]?(?:\d*\.\d+|\d+\.?)")
+
+
+def decode_path(d: str) -> list[tuple[float, float]]:
+    """Rebuilds absolute points from ``M x,y l dx dy ...`` or ``M x,y L ...``
+    path data, accumulating relative offsets the way a browser does."""
+    head, command, rest = re.match(r"M([^lL]*)([lL]?)(.*)", d).groups()
+    x, y = (float(n) for n in NUMBER_RE.findall(head))
+    points = [(x, y)]
+    values = [float(n) for n in NUMBER_RE.findall(rest)]
+    for a, b in zip(values[0::2], values[1::2]):
+        x, y = (x + a, y + b) if command == "l" else (a, b)
+        points.append((x, y))
+    return points
+
+
+def random_walk(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    x, y = 10.0, 10.0
+    points = []
+    for _ in range(n):
+        x += rng.uniform(-0.05, 0.05)
+        y += rng.uniform(-0.05, 0.05)
+        points.append({"x": x, "y": y})
+    return points
+
+
+def test_quantize_rounds_to_thousandth_of_a_foot():
+    assert PRECISION == 0.001
+    assert quantize(23.4567) == 23.457
+    assert quantize(23.4564) == 23.456
+    assert quantize(-7.0001) == -7.0
+    assert repr(quantize(0.1 + 0.2)) == "0.3"
+
+
+def test_quantize_error_within_half_precision():
+    rng = random.Random(1)
+    for _ in range(10000):
+        value = rng.uniform(-500, 500)
+        q = quantize(value)
+        assert abs(q - value) <= PRECISION / 2 + 1e-12
+        assert q == round(q, 3)
+
+
+def test_format_points_uses_at_most_precision_decimals():
+    text = format_points([{"x": 1.23456, "y": -0.5}, {"x": 20.0, "y": 3.1}])
+    assert text == "1.235,-.5 20,3.1"
+
+
+@pytest.mark.parametrize("relative", [True, False])
+def test_path_round_trip_within_half_precision(relative):
+    points = random_walk(500)
+    decoded = decode_path(format_path(points, relative=relative))
+    assert len(decoded) == len(points)
+    for (x, y), p in zip(decoded, points):
+        assert abs(x - p["x"]) <= PRECISION / 2 + 1e-9
+        assert abs(y - p["y"]) <= PRECISION / 2 + 1e-9
+
+
+def test_relative_path_does_not_accumulate_drift():
+    # Offsets are taken between quantized points, so the end of a long path
+    # is as accurate as its start.
+    points = random_walk(20000, seed=2)
+    decoded = decode_path(format_path(points))
+    errors = [math.hypot(x - p["x"], y - p["y"]) for (x, y), p in zip(decoded, points)]
+    assert max(errors) <= math.hypot(PRECISION / 2, PRECISION / 2) + 1e-9
+    quantized = [quantize_point(p) for p in points]
+    x, y = decoded[-1]
+    assert abs(x - quantized[-1]["x"]) < 1e-9
+    assert abs(y - quantized[-1]["y"]) < 1e-9
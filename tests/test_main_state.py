@@ -0,0 +1,179 @@
+import pytest
+import reflex as rx
+from reflex.istate.proxy import MutableProxy
+from app.states.main_state import MainState
+
+CANVAS_W, CANVAS_H = 600, 1080
+
+
+@pytest.fixture
+def root():
+    return rx.State(_reflex_internal_init=True)
+
+
+@pytest.fixture
+def state(root):
+    state = root.get_substate(MainState.get_full_name().split(".")[1:])
+    state.create_preset_plot()
+    flush(root)
+    return state
+
+
+def flush(root) -> dict:
+    """Computes the delta sent to the browser, as after an event."""
+    delta = root.get_delta()
+    root._clean()
+    return delta
+
+
+def mouse(state, x: float, y: float, **keys) -> dict:
+    """A canvas mouse event at world point (x, y)."""
+    vb_x, vb_y, vb_w, vb_h = (float(v) for v in state.viewbox_str.split())
+    return {
+        "client_x": (x - vb_x) / vb_w * CANVAS_W,
+        "client_y": (y - vb_y) / vb_h * CANVAS_H,
+        "bounding_client_rect": {
+            "left": 0,
+            "top": 0,
+            "width": CANVAS_W,
+            "height": CANVAS_H,
+        },
+        **keys,
+    }
+
+
+def draw_rectangle(state, x0, y0, x1, y1):
+    state.set_active_tool("rectangle")
+    state.handle_canvas_mouse_down(mouse(state, x0, y0))
+    state.handle_canvas_mouse_up(mouse(state, x1, y1))
+
+
+def test_drawing_a_rectangle_completes_step_2(root, state):
+    state.next_step()
+    flush(root)
+    assert state.current_step == 2
+    assert not state.can_proceed
+    draw_rectangle(state, 10, 10, 20, 30)
+    flush(root)
+    assert len(state.shapes) == 2
+    assert state.can_proceed
+
+
+def plot_points(state) -> list[dict]:
+    return next(s["points"] for s in state.shapes if s["id"] == "plot_boundary")
+
+
+def test_transform_handles_leave_plot_boundary_alone(root, state):
+    assert state.selected_shape_id == "plot_boundary"
+    assert state.selection_handles == []
+    before = plot_points(state)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 50, 90))
+    state.handle_canvas_mouse_up(mouse(state, 60, 100))
+    flush(root)
+    assert plot_points(state) == before
+
+
+def test_transform_of_mixed_selection_skips_plot(root, state):
+    before = plot_points(state)
+    draw_rectangle(state, 10, 10, 20, 30)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 12, 20))
+    state.handle_canvas_mouse_up(mouse(state, 12, 20))
+    state.handle_canvas_mouse_down(mouse(state, 0, 45, shift_key=True))
+    state.handle_canvas_mouse_up(mouse(state, 0, 45, shift_key=True))
+    flush(root)
+    assert len(state.selected_shape_ids) == 2
+    assert [s["layer"] for s in state.transformable_shapes] == ["default"]
+    # Drag the south-east handle of the rectangle's box.
+    state.handle_canvas_mouse_down(mouse(state, 20, 30))
+    state.handle_canvas_mouse_move(mouse(state, 25, 40))
+    state.handle_canvas_mouse_up(mouse(state, 25, 40))
+    flush(root)
+    (rect,) = [s for s in state.shapes if s["id"] != "plot_boundary"]
+    xs = [p["x"] for p in rect["points"]]
+    ys = [p["y"] for p in rect["points"]]
+    assert (min(xs), max(xs), min(ys), max(ys)) == pytest.approx((10, 25, 10, 40))
+    assert plot_points(state) == before
+
+
+def test_dimension_edit_leaves_plot_boundary_alone(root, state):
+    assert state.selected_shape_id == "plot_boundary"
+    assert not state.can_edit_dimensions
+    before = plot_points(state)
+    state.set_dimension("w", "10")
+    state.set_dimension("x", "5")
+    flush(root)
+    assert plot_points(state) == before
+    assert (state.plot_width_ft, state.plot_height_ft) == ("50", "90")
+
+
+def test_dimension_edit_skips_locked_layer(root, state):
+    draw_rectangle(state, 10, 10, 20, 30)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 12, 20))
+    state.handle_canvas_mouse_up(mouse(state, 12, 20))
+    flush(root)
+    assert state.can_edit_dimensions
+    state.set_dimension("w", "15")
+    state.toggle_layer_lock("default")
+    state.set_dimension("w", "5")
+    flush(root)
+    (rect,) = [s for s in state.shapes if s["id"] != "plot_boundary"]
+    xs = [p["x"] for p in rect["points"]]
+    assert (min(xs), max(xs)) == (10, 25)
+
+
+def test_stroke_edit_ignores_unparseable_input(root, state):
+    draw_rectangle(state, 10, 10, 20, 30)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 12, 20))
+    state.handle_canvas_mouse_up(mouse(state, 12, 20))
+    state.set_shape_stroke("0.5")
+    for value in ("", "-", "abc", "0", "-1"):
+        state.set_shape_stroke(value)
+    flush(root)
+    (rect,) = [s for s in state.shapes if s["id"] != "plot_boundary"]
+    assert rect["stroke_mm"] == 0.5
+
+
+def test_edits_on_export_step_schedule_a_preview_refresh(root, state):
+    refresh = [MainState.refresh_preview_after_edit]
+    draw_rectangle(state, 10, 10, 20, 30)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 12, 20))
+    state.handle_canvas_mouse_up(mouse(state, 12, 20))
+    assert state.set_shape_color("#ff0000") == []
+    state.current_step = 4
+    assert state.set_shape_color("#00ff00") == refresh
+    assert state.set_dimension("w", "12") == refresh
+    assert state.toggle_layer_visibility("default") == refresh
+    state._preview_stale = False
+    assert state.set_shape_stroke("") is None
+    state.handle_canvas_mouse_down(mouse(state, 300, 300))
+    assert state.handle_canvas_mouse_up(mouse(state, 300, 300)) is None
+
+
+def proxies_in(value) -> int:
+    if isinstance(value, MutableProxy):
+        return 1 + proxies_in(value.__wrapped__)
+    if isinstance(value, dict):
+        return sum(proxies_in(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(proxies_in(v) for v in value)
+    return 0
+
+
+def test_edits_store_plain_values(root, state):
+    draw_rectangle(state, 10, 10, 20, 30)
+    state.set_active_tool("select")
+    state.handle_canvas_mouse_down(mouse(state, 12, 20))
+    state.handle_canvas_mouse_up(mouse(state, 12, 20))
+    state.set_shape_color("#ff0000")
+    state.set_dimension("w", "12")
+    state.set_shape_layer("rooms")
+    state.toggle_layer_lock("plot")
+    flush(root)
+    stored = state._backend_vars
+    assert proxies_in(stored["_layer_shapes"]) == 0
+    assert proxies_in(stored["_layer_instances"]) == 0
@@ -0,0 +1,138 @@
+import io
+import math
+import pytest
+from app.core.plan_import import PlanReader, open_reader
+
+
+def dxf(*entities: str) -> io.StringIO:
+    body = "".join(entities)
+    return io.StringIO(f"0\nSECTION\n2\nENTITIES\n{body}0\nENDSEC\n0\nEOF\n")
+
+
+def read(source: io.IOBase, fmt: str, **kwargs) -> tuple[list, PlanReader]:
+    reader = open_reader(source, fmt, **kwargs)
+    return list(reader), reader
+
+
+def test_plan_reader_is_abstract():
+    with pytest.raises(TypeError):
+        PlanReader(io.StringIO())
+
+
+def test_lwpolyline_bulge_is_flattened_to_arc():
+    # Bulge 1 is a counter-clockwise half circle of radius 5 about (5, 0).
+    shapes, _ = read(
+        dxf("0\nLWPOLYLINE\n90\n2\n70\n0\n10\n0\n20\n0\n42\n1\n10\n10\n20\n0\n"),
+        "dxf",
+    )
+    (shape,) = shapes
+    points = shape["points"]
+    assert len(points) > 4
+    assert points[0] == {"x": 0.0, "y": 0.0}
+    assert points[-1] == {"x": 10.0, "y": 0.0}
+    for p in points:
+        assert math.hypot(p["x"] - 5, p["y"]) == pytest.approx(5, abs=0.002)
+    # DXF is y-up, so the arc below the chord ends up at positive canvas y.
+    assert max(p["y"] for p in points) == pytest.approx(5, abs=0.002)
+
+
+def test_closed_lwpolyline_flattens_closing_bulge():
+    # Two half circles: a full circle of radius 5 about (5, 0).
+    shapes, _ = read(
+        dxf("0\nLWPOLYLINE\n90\n2\n70\n1\n10\n0\n20\n0\n42\n1\n10\n10\n20\n0\n42\n1\n"),
+        "dxf",
+    )
+    (shape,) = shapes
+    assert shape["is_closed"]
+    assert shape["area"] == pytest.approx(math.pi * 25, rel=0.01)
+
+
+def test_spline_evaluates_curve_not_control_polygon():
+    # Clamped quadratic B-spline == Bezier with control points
+    # (0, 0), (5, 10), (10, 0): its peak is y = 5, not the control point's 10.
+    shapes, _ = read(
+        dxf(
+            "0\nSPLINE\n70\n8\n71\n2\n72\n6\n73\n3\n"
+            "40\n0\n40\n0\n40\n0\n40\n1\n40\n1\n40\n1\n"
+            "10\n0\n20\n0\n10\n5\n20\n10\n10\n10\n20\n0\n"
+        ),
+        "dxf",
+    )
+    (shape,) = shapes
+    points = shape["points"]
+    assert len(points) > 3
+    assert min(p["y"] for p in points) == pytest.approx(-5, abs=0.02)
+    for p in points:
+        t = p["x"] / 10
+        assert -p["y"] == pytest.approx(20 * t * (1 - t), abs=0.021)
+
+
+def test_spline_without_knots_falls_back_to_fit_points(caplog):
+    shapes, _ = read(
+        dxf("0\nSPLINE\n70\n8\n71\n3\n11\n0\n21\n0\n11\n5\n21\n3\n11\n10\n21\n0\n"),
+        "dxf",
+    )
+    (shape,) = shapes
+    assert [p["x"] for p in shape["points"]] == [0.0, 5.0, 10.0]
+    assert "approximated" in caplog.text
+
+
+def test_svg_percentages_resolve_against_view_box():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100%" '
+        'viewBox="0 0 200 100">'
+        '<rect x="10%" y="0" width="50%" height="50%"/></svg>'
+    )
+    shapes, _ = read(io.BytesIO(svg.encode()), "svg", units="ft")
+    (shape,) = shapes
+    xs = [p["x"] for p in shape["points"]]
+    ys = [p["y"] for p in shape["points"]]
+    assert (min(xs), max(xs), min(ys), max(ys)) == (20.0, 120.0, 0.0, 50.0)
+
+
+def test_svg_percentages_without_view_box_are_skipped():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<rect x="0" y="0" width="50%" height="10"/>'
+        '<line x1="0" y1="0" x2="10" y2="0"/></svg>'
+    )
+    shapes, reader = read(io.BytesIO(svg.encode()), "svg", units="ft")
+    assert [s["type"] for s in shapes] == ["line"]
+    assert reader.entities_skipped == 1
+
+
+def test_polyline_vertex_bulge_is_flattened_to_arc():
+    shapes, _ = read(
+        dxf(
+            "0\nPOLYLINE\n66\n1\n70\n0\n"
+            "0\nVERTEX\n10\n0\n20\n0\n42\n1\n"
+            "0\nVERTEX\n10\n10\n20\n0\n"
+            "0\nSEQEND\n"
+        ),
+        "dxf",
+    )
+    (shape,) = shapes
+    points = shape["points"]
+    assert len(points) > 4
+    for p in points:
+        assert math.hypot(p["x"] - 5, p["y"]) == pytest.approx(5, abs=0.002)
+
+
+def svg_rect_width_ft(root_attrs: str) -> float:
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" {root_attrs}>'
+        '<rect x="0" y="0" width="100" height="100"/></svg>'
+    )
+    (shape,), _ = read(io.BytesIO(svg.encode()), "svg", tolerance_ft=0.0)
+    xs = [p["x"] for p in shape["points"]]
+    return max(xs) - min(xs)
+
+
+def test_svg_physical_width_without_view_box_uses_pixels():
+    # Without a viewBox a user unit is one CSS px (1/96 in), not one mm.
+    assert svg_rect_width_ft('width="210mm"') == pytest.approx(100 / 1152, abs=0.001)
+
+
+def test_svg_physical_width_with_view_box_scales_user_units():
+    width = svg_rect_width_ft('width="210mm" viewBox="0 0 210 297"')
+    assert width == pytest.approx(100 / 304.8, abs=0.001)
@@ -0,0 +1,51 @@
+from app.core.export_cache import ExportCache
+from app.core.preview import (
+    PREVIEW_DPIS,
+    cached_preview,
+    preview_keys,
+    render_preview,
+)
+from app.core.project import make_project
+
+
+def project():
+    shape = {
+        "id": "plot_boundary",
+        "type": "rectangle",
+        "points": [
+            {"x": 0.0, "y": 0.0},
+            {"x": 50.0, "y": 0.0},
+            {"x": 50.0, "y": 90.0},
+            {"x": 0.0, "y": 90.0},
+        ],
+        "stroke_mm": 0.25,
+        "stroke_color": "#1a1a1a",
+        "fill_color": "transparent",
+        "layer": "plot",
+        "label_visibility": False,
+        "is_closed": True,
+        "area": 4500.0,
+    }
+    return make_project([shape], "50", "90")
+
+
+def test_misses_are_counted_only_for_renders(tmp_path):
+    cache = ExportCache(tmp_path)
+    keys = preview_keys(project())
+    assert cached_preview(keys, cache) is None
+    assert cache.stats()["misses"] == 0
+    for dpi in PREVIEW_DPIS:
+        render_preview(project(), dpi, keys[dpi], cache)
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (len(PREVIEW_DPIS), 0)
+
+
+def test_finest_cached_level_is_reused(tmp_path):
+    cache = ExportCache(tmp_path)
+    keys = preview_keys(project())
+    rel = render_preview(project(), PREVIEW_DPIS[-1], keys[PREVIEW_DPIS[-1]], cache)
+    assert cached_preview(keys, cache) == PREVIEW_DPIS[-1]
+    assert (
+        render_preview(project(), PREVIEW_DPIS[-1], keys[PREVIEW_DPIS[-1]], cache)
+        == rel
+    )
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
@@ -0,0 +1,75 @@
+import io
+from app.core.export import render_project
+from app.core.project import make_project, visible_shapes
+from app.core.symbols import SYMBOLS_BY_ID, expand_instance
+
+
+def instance(symbol_id="window", layer="fixtures", **fields):
+    return {
+        "id": "sym_1",
+        "symbol_id": symbol_id,
+        "x": 10.0,
+        "y": 5.0,
+        "rotation_deg": 0.0,
+        "scale_x": 1.0,
+        "scale_y": 1.0,
+        "layer": layer,
+        **fields,
+    }
+
+
+def layer(name, visible=True):
+    return {"name": name, "visible": visible, "locked": False}
+
+
+def test_expand_translates_local_geometry():
+    shapes = expand_instance(instance())
+    assert [s["id"] for s in shapes] == ["sym_1:0", "sym_1:1"]
+    assert [s["type"] for s in shapes] == ["polygon", "line"]
+    assert {s["layer"] for s in shapes} == {"fixtures"}
+    assert shapes[1]["points"] == [{"x": 10.0, "y": 5.0}, {"x": 14.0, "y": 5.0}]
+    assert shapes[0]["area"] == 2.0
+
+
+def test_expand_scales_then_rotates_about_insertion_point():
+    shapes = expand_instance(instance(rotation_deg=90.0, scale_x=2.0, scale_y=3.0))
+    frame, sill = shapes
+    assert sill["points"] == [{"x": 10.0, "y": 5.0}, {"x": 10.0, "y": 13.0}]
+    assert frame["points"][0] == {"x": 10.75, "y": 5.0}
+    assert frame["points"][2] == {"x": 9.25, "y": 13.0}
+    assert frame["area"] == 12.0
+
+
+def test_expand_open_arc_is_freehand():
+    shapes = expand_instance(instance("door", rotation_deg=180.0))
+    leaf, swing = shapes
+    assert leaf["points"] == [{"x": 10.0, "y": 5.0}, {"x": 10.0, "y": 8.0}]
+    assert swing["type"] == "freehand"
+    assert len(swing["points"]) == len(SYMBOLS_BY_ID["door"]["paths"][1]["points"])
+    assert not swing["is_closed"]
+
+
+def test_unknown_symbol_expands_to_nothing():
+    assert expand_instance(instance("bathtub")) == []
+    project = make_project([], "20", "20", symbols=[instance("bathtub")])
+    assert visible_shapes(project) == []
+
+
+def test_hidden_layer_symbols_are_not_exported():
+    shown = make_project(
+        [], "20", "20", layers=[layer("fixtures")], symbols=[instance()]
+    )
+    hidden = make_project(
+        [], "20", "20", layers=[layer("fixtures", False)], symbols=[instance()]
+    )
+    assert [s["id"] for s in visible_shapes(shown)] == ["sym_1:0", "sym_1:1"]
+    assert visible_shapes(hidden) == []
+
+    def png(project):
+        out = io.BytesIO()
+        render_project(project, "png", 20, out)
+        return out.getvalue()
+
+    empty = png(make_project([], "20", "20"))
+    assert png(hidden) == empty
+    assert png(shown) != empty
@@ -0,0 +1,173 @@
+import random
+from app.core.wall_graph import WallGraph, segment_intersections
+
+
+def pt(x, y):
+    return {"x": float(x), "y": float(y)}
+
+
+def box(prefix, x0, y0, x1, y1):
+    """Four walls drawn end to end around a rectangle."""
+    corners = [pt(x0, y0), pt(x1, y0), pt(x1, y1), pt(x0, y1)]
+    return [(f"{prefix}{i}", corners[i], corners[(i + 1) % 4]) for i in range(4)]
+
+
+def summary(graph):
+    """Rooms independent of face ids and of where each cycle starts."""
+    return sorted(
+        (
+            room["area"],
+            room["centroid"]["x"],
+            room["centroid"]["y"],
+            tuple(sorted((p["x"], p["y"]) for p in room["points"])),
+        )
+        for room in graph.rooms()
+    )
+
+
+def areas(graph):
+    return sorted(room["area"] for room in graph.rooms())
+
+
+def test_single_room():
+    graph = WallGraph.from_segments(box("w", 0, 0, 20, 10))
+    (room,) = graph.rooms()
+    assert room["area"] == 200.0
+    assert room["centroid"] == {"x": 10.0, "y": 5.0}
+    assert len(room["points"]) == 4
+
+
+def test_crossing_walls_split_rooms():
+    walls = box("w", 0, 0, 10, 10) + [
+        ("a", pt(5, -2), pt(5, 12)),
+        ("b", pt(-2, 5), pt(12, 5)),
+    ]
+    graph = WallGraph.from_segments(walls)
+    assert areas(graph) == [25.0] * 4
+    centroids = {(r["centroid"]["x"], r["centroid"]["y"]) for r in graph.rooms()}
+    assert centroids == {(2.5, 2.5), (7.5, 2.5), (2.5, 7.5), (7.5, 7.5)}
+
+
+def test_t_junction_splits_room():
+    walls = box("w", 0, 0, 20, 10) + [("d", pt(10, 0), pt(10, 10))]
+    graph = WallGraph.from_segments(walls)
+    assert areas(graph) == [100.0, 100.0]
+    assert all(len(room["points"]) == 4 for room in graph.rooms())
+
+
+def test_collinear_overlap_is_one_wall():
+    walls = box("w", 0, 0, 20, 10)[1:] + [
+        ("a", pt(0, 0), pt(12, 0)),
+        ("b", pt(8, 0), pt(20, 0)),
+    ]
+    graph = WallGraph.from_segments(walls)
+    (room,) = graph.rooms()
+    assert room["area"] == 200.0
+    points = [(p["x"], p["y"]) for p in room["points"]]
+    assert len(points) == len(set(points))
+
+
+def test_remove_merges_junctions_back():
+    graph = WallGraph.from_segments(box("w", 0, 0, 20, 10))
+    graph.add_wall("d", pt(10, 0), pt(10, 10))
+    assert areas(graph) == [100.0, 100.0]
+    graph.remove_wall("d")
+    (room,) = graph.rooms()
+    assert room["area"] == 200.0
+    assert len(room["points"]) == 4
+    assert summary(graph) == summary(WallGraph.from_segments(box("w", 0, 0, 20, 10)))
+
+
+def test_move_wall_retraces_rooms():
+    graph = WallGraph.from_segments(
+        box("w", 0, 0, 20, 10) + [("d", pt(10, 0), pt(10, 10))]
+    )
+    graph.move_wall("d", pt(5, 0), pt(5, 10))
+    assert areas(graph) == [50.0, 150.0]
+    graph.move_wall("d", pt(25, 0), pt(25, 10))
+    assert areas(graph) == [200.0]
+    assert len(graph.rooms()[0]["points"]) == 4
+
+
+def test_remove_crossing_merges_junction_on_overlapping_walls():
+    walls = box("w", 0, 0, 20, 10) + [("dup", pt(0, 0), pt(20, 0))]
+    graph = WallGraph.from_segments(walls)
+    graph.add_wall("x", pt(5, -5), pt(5, 5))
+    graph.remove_wall("x")
+    assert summary(graph) == summary(WallGraph.from_segments(walls))
+    assert len(graph.rooms()[0]["points"]) == 4
+
+
+def test_zero_length_wall_adds_no_junctions():
+    walls = box("w", 0, 0, 20, 10) + [
+        ("diag", pt(0, 0), pt(20, 10)),
+        ("dot", pt(3, 7), pt(3, 7)),
+    ]
+    rooms = WallGraph.from_segments(walls).rooms()
+    assert [len(room["points"]) for room in rooms] == [3, 3]
+
+
+def test_intersection_does_not_depend_on_argument_order():
+    a, b, c, d = pt(20, 4), pt(10, 15), pt(1, 1), pt(27, 14)
+    assert segment_intersections(a, b, c, d) == segment_intersections(c, d, a, b)
+
+
+def test_loop_inside_room_is_subtracted():
+    graph = WallGraph.from_segments(box("w", 0, 0, 20, 10) + box("c", 5, 3, 8, 6))
+    assert areas(graph) == [9.0, 191.0]
+    outer = max(graph.rooms(), key=lambda room: room["area"])
+    assert outer["centroid"] == {
+        "x": round((200 * 10 - 9 * 6.5) / 191, 3),
+        "y": round((200 * 5 - 9 * 4.5) / 191, 3),
+    }
+
+
+def test_nested_loops_subtract_from_innermost_room():
+    walls = box("w", 0, 0, 20, 10) + box("c", 5, 3, 8, 6) + box("k", 6, 4, 7, 5)
+    graph = WallGraph.from_segments(walls)
+    assert areas(graph) == [1.0, 8.0, 191.0]
+
+
+def test_loop_subtracts_only_from_its_own_room():
+    walls = (
+        box("w", 0, 0, 20, 10) + [("d", pt(10, 0), pt(10, 10))] + box("c", 13, 3, 16, 6)
+    )
+    graph = WallGraph.from_segments(walls)
+    assert areas(graph) == [9.0, 91.0, 100.0]
+
+
+def test_free_standing_stub_leaves_area_unchanged():
+    walls = box("w", 0, 0, 20, 10) + [("s", pt(5, 5), pt(8, 5))]
+    assert areas(WallGraph.from_segments(walls)) == [200.0]
+
+
+def test_incremental_edits_match_full_rebuild():
+    rng = random.Random(7)
+    walls = {}
+    for i in range(3):
+        for j in range(3):
+            for wall_id, a, b in box(
+                f"r{i}{j}_", i * 10, j * 10, i * 10 + 10, j * 10 + 10
+            ):
+                walls[wall_id] = (a, b)
+    walls.update({wall_id: (a, b) for wall_id, a, b in box("c", 12, 12, 16, 15)})
+    walls["diag"] = (pt(1, 0.5), pt(29, 28.5))
+    graph = WallGraph()
+    for wall_id, (a, b) in walls.items():
+        graph.add_wall(wall_id, a, b)
+    assert summary(graph) == summary(
+        WallGraph.from_segments([(k, a, b) for k, (a, b) in walls.items()])
+    )
+    for step in range(60):
+        wall_id = rng.choice(sorted(walls))
+        if step % 3 == 0:
+            graph.remove_wall(wall_id)
+            del walls[wall_id]
+        else:
+            a = pt(rng.randrange(0, 31), rng.randrange(0, 31))
+            b = pt(rng.randrange(0, 31), rng.randrange(0, 31))
+            graph.move_wall(wall_id, a, b)
+            walls[wall_id] = (a, b)
+        rebuilt = WallGraph.from_segments([(k, a, b) for k, (a, b) in walls.items()])
+        assert len(graph) == len(rebuilt)
+        assert summary(graph) == summary(rebuilt)